@@ -0,0 +1,347 @@
+"""
+Motor bus throughput and latency benchmarks for DirectMotorsService
+
+Runs the real service against a serial port - by default the in-process
+STS3215 emulator (sts3215://bench), or any device path such as the pty
+printed by `python -m lelamp.service.motors.sts_emulator` or a real bus -
+and measures:
+
+  writes     per-frame write latency percentiles, CPU time per frame,
+             packets/s and bytes/s for back-to-back frames
+  ab         per-motor WRITE packets vs one batched SYNC_WRITE per frame
+  budget     bus utilization at 30/60/100 fps through the bus writer,
+             with telemetry polling running as in production
+  playback   scheduler jitter for every recording in lelamp/recordings
+
+Results are written as JSON (with the git commit) so runs can be compared:
+
+    python -m benchmarks.motors.bench_motors
+    python -m benchmarks.motors.bench_motors --compare benchmarks/motors/results/motors-<old>.json
+
+CPU time is process-wide, so with the in-process emulator it includes the
+emulated servos; use the pty emulator to exclude them.
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from lelamp.service.motors.direct_motors_service import DirectMotorsService
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+BITS_PER_BYTE = 10  # 8N1
+
+
+class CountingSerial:
+    """Serial port proxy counting the bytes and packets written and read"""
+
+    def __init__(self, ser):
+        self._ser = ser
+        self._lock = threading.Lock()
+        self.bytes_tx = 0
+        self.bytes_rx = 0
+        self.writes = 0
+
+    def write(self, data):
+        with self._lock:
+            self.bytes_tx += len(data)
+            self.writes += 1
+        return self._ser.write(data)
+
+    def read(self, size=1):
+        data = self._ser.read(size)
+        with self._lock:
+            self.bytes_rx += len(data)
+        return data
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return {"bytes_tx": self.bytes_tx, "bytes_rx": self.bytes_rx, "writes": self.writes}
+
+    def __getattr__(self, name):
+        return getattr(self._ser, name)
+
+
+def percentiles(samples_s: List[float]) -> Dict[str, float]:
+    """Latency summary in milliseconds"""
+    if not samples_s:
+        return {}
+    ms = np.asarray(samples_s) * 1000
+    return {
+        "mean_ms": float(ms.mean()),
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p95_ms": float(np.percentile(ms, 95)),
+        "p99_ms": float(np.percentile(ms, 99)),
+        "max_ms": float(ms.max()),
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                             cwd=os.path.dirname(__file__), timeout=5)
+        return out.stdout.strip() or None
+    except Exception:
+        return None
+
+
+def wave_frame(service: DirectMotorsService, i: int) -> Dict[int, int]:
+    """A goal frame that differs from the previous one on every joint (defeats the deadband)"""
+    base = service._home_pose()
+    return {motor_id: int(base[k] + 40 * math.sin(i * 0.2 + k)) + (i & 1)
+            for k, motor_id in enumerate(service.MOTOR_IDS)}
+
+
+@contextmanager
+def unlimited(service: DirectMotorsService):
+    """Bypass the host-side motion limiter: back-to-back frames are microseconds
+    apart, so it would clamp each one to the previous pose and the deadband
+    would then drop it, leaving nothing on the wire to measure"""
+    limits = service.limiter.limits
+    service.limiter.limits = {}
+    try:
+        yield
+    finally:
+        service.limiter.limits = limits
+        service.limiter.reset()
+
+
+def measure_writes(service: DirectMotorsService, counter: CountingSerial, frames: int,
+                   write_frame) -> dict:
+    """Back-to-back frames through write_frame(goals); latency per frame under the bus lock"""
+    with unlimited(service):
+        return _measure_writes(service, counter, frames, write_frame)
+
+
+def _measure_writes(service: DirectMotorsService, counter: CountingSerial, frames: int,
+                    write_frame) -> dict:
+    latencies = []
+    before = counter.snapshot()
+    cpu0, t0 = time.process_time(), time.perf_counter()
+    for i in range(frames):
+        goals = wave_frame(service, i)
+        start = time.perf_counter()
+        with service.bus.lock:
+            write_frame(goals)
+        latencies.append(time.perf_counter() - start)
+    elapsed = time.perf_counter() - t0
+    cpu = time.process_time() - cpu0
+    after = counter.snapshot()
+
+    packets = after["writes"] - before["writes"]
+    tx = after["bytes_tx"] - before["bytes_tx"]
+    rx = after["bytes_rx"] - before["bytes_rx"]
+    bytes_per_frame = (tx + rx) / frames
+    return {
+        "frames": frames,
+        "latency": percentiles(latencies),
+        "cpu_us_per_frame": cpu / frames * 1e6,
+        "packets_per_s": packets / elapsed,
+        "bytes_per_s": tx / elapsed,
+        "packets_per_frame": packets / frames,
+        "bytes_per_frame": bytes_per_frame,
+        "wire_us_per_frame": bytes_per_frame * BITS_PER_BYTE / service.baudrate * 1e6,
+        "max_fps_on_wire": service.baudrate / (bytes_per_frame * BITS_PER_BYTE),
+    }
+
+
+def bench_writes(service: DirectMotorsService, counter: CountingSerial, frames: int) -> dict:
+    return measure_writes(service, counter, frames, service.write_goal_frame)
+
+
+def bench_ab(service: DirectMotorsService, counter: CountingSerial, frames: int) -> dict:
+    """Per-motor WRITE packets (one per joint) vs one SYNC_WRITE per frame"""
+    def per_motor(goals):
+        for motor_id, position in goals.items():
+            service._set_position(motor_id, position)
+
+    result = {
+        "per_motor": measure_writes(service, counter, frames, per_motor),
+        "batched": measure_writes(service, counter, frames, service.write_goal_frame),
+    }
+    a, b = result["per_motor"], result["batched"]
+    result["batched_speedup"] = {
+        "latency_p50": a["latency"]["p50_ms"] / max(b["latency"]["p50_ms"], 1e-9),
+        "cpu_per_frame": a["cpu_us_per_frame"] / max(b["cpu_us_per_frame"], 1e-9),
+        "bytes_per_frame": a["bytes_per_frame"] / max(b["bytes_per_frame"], 1e-9),
+    }
+    return result
+
+
+def bench_budget(service: DirectMotorsService, counter: CountingSerial, fps_list: List[int],
+                 seconds: float) -> dict:
+    """Paced frames through claim_joints at each fps, as animations drive the bus"""
+    results = {}
+    for fps in fps_list:
+        period = 1.0 / fps
+        before = counter.snapshot()
+        written0 = service.bus.frames_written
+        late = []
+        cpu0, t0 = time.process_time(), time.perf_counter()
+        next_frame = time.perf_counter()
+        i = 0
+        while time.perf_counter() - t0 < seconds:
+            now = time.perf_counter()
+            late.append(max(0.0, now - next_frame))
+            service.claim_joints("animation", wave_frame(service, i))
+            i += 1
+            next_frame += period
+            delay = next_frame - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        elapsed = time.perf_counter() - t0
+        cpu = time.process_time() - cpu0
+        after = counter.snapshot()
+        written = service.bus.frames_written - written0
+
+        tx = after["bytes_tx"] - before["bytes_tx"]
+        rx = after["bytes_rx"] - before["bytes_rx"]
+        wire_s = (tx + rx) * BITS_PER_BYTE / service.baudrate
+        results[str(fps)] = {
+            "frames_claimed": i,
+            "frames_written": written,
+            "achieved_fps": written / elapsed,
+            "pacing_late": percentiles(late),
+            "cpu_us_per_frame": cpu / max(written, 1) * 1e6,
+            "bytes_tx_per_s": tx / elapsed,
+            "bytes_rx_per_s": rx / elapsed,
+            "bus_utilization": wire_s / elapsed,
+        }
+        service.release_joints("animation")
+    return results
+
+
+def bench_playback(service: DirectMotorsService, names: List[str], rate: float) -> dict:
+    results = {}
+    for name in names:
+        cpu0 = time.process_time()
+        service._handle_play(name, rate=rate)
+        cpu = time.process_time() - cpu0
+        stats = service.playback_stats.get(name)
+        if stats is None:
+            continue
+        data = stats.as_dict()
+        data["cpu_us_per_frame"] = cpu / max(stats.frames_sent, 1) * 1e6
+        results[name] = data
+        print(f"  {name}: {stats.frames_sent} frames, jitter p95 {stats.jitter_p95_ms:.2f}ms "
+              f"max {stats.jitter_max_ms:.2f}ms")
+    return results
+
+
+def flatten(data, prefix="") -> Dict[str, float]:
+    flat = {}
+    for key, value in data.items():
+        path = f"{prefix}.{key}" if prefix else str(key)
+        if isinstance(value, dict):
+            flat.update(flatten(value, path))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[path] = float(value)
+    return flat
+
+
+def compare(baseline: dict, current: dict):
+    """Print every numeric result that changed by more than 5%"""
+    old = flatten(baseline.get("results", {}))
+    new = flatten(current.get("results", {}))
+    print(f"\nComparison vs {baseline.get('commit')}:")
+    changed = 0
+    for path in sorted(old.keys() & new.keys()):
+        a, b = old[path], new[path]
+        if a == 0 or abs(b - a) / abs(a) < 0.05:
+            continue
+        changed += 1
+        print(f"  {path}: {a:.4g} -> {b:.4g} ({(b - a) / abs(a):+.0%})")
+    if not changed:
+        print("  no metric changed by more than 5%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the motor bus of DirectMotorsService")
+    parser.add_argument('--port', type=str, default="sts3215://bench",
+                        help='Serial port or URL (default: in-process emulator sts3215://bench)')
+    parser.add_argument('--baudrate', type=int, default=1000000, help='Baud rate (default: 1000000)')
+    parser.add_argument('--frames', type=int, default=2000, help='Frames per write benchmark (default: 2000)')
+    parser.add_argument('--fps', type=str, default="30,60,100", help='Frame rates for the bus budget (default: 30,60,100)')
+    parser.add_argument('--seconds', type=float, default=3.0, help='Duration of each bus budget run (default: 3)')
+    parser.add_argument('--telemetry-rate', type=float, default=10.0, help='Telemetry SYNC_READ rate during the run (default: 10)')
+    parser.add_argument('--playback-rate', type=float, default=1.0, help='Speed factor for recording playback (default: 1.0)')
+    parser.add_argument('--recordings', type=str, default=None, help='Comma-separated recordings to play (default: all)')
+    parser.add_argument('--skip', type=str, default="", help='Comma-separated benchmarks to skip: writes,ab,budget,playback')
+    parser.add_argument('--output', type=str, default=None, help='JSON output path (default: benchmarks/motors/results/motors-<commit>.json)')
+    parser.add_argument('--compare', type=str, default=None, help='Earlier JSON result to compare against')
+    args = parser.parse_args()
+
+    skip = set(filter(None, args.skip.split(",")))
+    commit = git_commit()
+    service = DirectMotorsService(port=args.port, baudrate=args.baudrate, telemetry_rate=args.telemetry_rate)
+    service.start()
+    counter = CountingSerial(service.ser)
+    with service.bus.lock:
+        service.ser = counter
+
+    results = {}
+    try:
+        # Keeps the idle loop off the bus so only benchmark traffic is measured
+        service._is_animating = True
+        service.release_joints("idle")
+        if "writes" not in skip:
+            print("📏 Back-to-back frame writes...")
+            results["writes"] = bench_writes(service, counter, args.frames)
+        if "ab" not in skip:
+            print("📏 Per-motor writes vs batched frames...")
+            results["ab"] = bench_ab(service, counter, args.frames)
+        if "budget" not in skip:
+            fps_list = [int(f) for f in args.fps.split(",")]
+            print(f"📏 Bus budget at {fps_list} fps...")
+            results["budget"] = bench_budget(service, counter, fps_list, args.seconds)
+        service._is_animating = False
+        if "playback" not in skip:
+            names = args.recordings.split(",") if args.recordings else service.get_available_recordings()
+            print(f"📏 Playback jitter for {len(names)} recordings...")
+            results["playback"] = bench_playback(service, names, args.playback_rate)
+        results["write_stats"] = dict(service.write_stats)
+    finally:
+        service.stop()
+
+    report = {
+        "commit": commit,
+        "timestamp": time.time(),
+        "platform": platform.platform(),
+        "python": sys.version.split()[0],
+        "config": {k: v for k, v in vars(args).items() if k not in ("output", "compare")},
+        "results": results,
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"motors-{commit or 'unknown'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    if "writes" in results:
+        w = results["writes"]
+        print(f"\nSYNC_WRITE frame: p50 {w['latency']['p50_ms']:.3f}ms p99 {w['latency']['p99_ms']:.3f}ms, "
+              f"{w['cpu_us_per_frame']:.0f}us CPU, {w['bytes_per_frame']:.0f} bytes "
+              f"(wire limit {w['max_fps_on_wire']:.0f} fps)")
+    if "ab" in results:
+        s = results["ab"]["batched_speedup"]
+        print(f"Batched vs per-motor: {s['latency_p50']:.1f}x latency, {s['cpu_per_frame']:.1f}x CPU, "
+              f"{s['bytes_per_frame']:.1f}x bytes")
+    for fps, b in results.get("budget", {}).items():
+        print(f"{fps:>4} fps: {b['achieved_fps']:.1f} fps written, bus {b['bus_utilization']:.1%} busy")
+    print(f"\n✅ Results written to {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+import argparse
+import os
+import csv
+
+import numpy as np
+
+from .convert_recordings import estimate_fps
+from .service.motors.animation_file import ANIMATION_EXTENSION, read_animation, write_animation
+from .service.motors.direct_motors_service import MOTOR_NAMES
+from .service.motors.keyframes import KEYFRAME_EXTENSION
+from .service.motors.playback import frame_times
+from .service.motors.recording_cache import SOURCE_EXTENSIONS, find_recordings, read_recording
+from .service.motors.recording_cleanup import (
+    DEFAULT_DUPLICATE_TOLERANCE, DEFAULT_IDLE_THRESHOLD, DEFAULT_SMOOTH_SIGMA, clean_recording,
+)
+
+
+def write_csv_recording(path, joints, timestamps, degrees):
+    with open(path, 'w', newline='') as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(['timestamp'] + [f"{name}.pos" for name in joints])
+        writer.writerows(np.column_stack([timestamps, degrees]).tolist())
+
+
+def clean_file(path, sigma=DEFAULT_SMOOTH_SIGMA, idle_threshold=DEFAULT_IDLE_THRESHOLD,
+               duplicate_tolerance=DEFAULT_DUPLICATE_TOLERANCE, default_fps=30, dry_run=False):
+    """Clean a recording in place and print what was removed."""
+    joints, timestamps, degrees = read_recording(path, MOTOR_NAMES)
+    if len(degrees) == 0:
+        print(f"{os.path.basename(path)}: no frames, skipped")
+        return None
+    fps = estimate_fps(timestamps, default_fps)
+    times = frame_times(timestamps, len(degrees), fps)
+    as_ticks = path.endswith(ANIMATION_EXTENSION) and read_animation(path).values.dtype == np.int16
+    degrees = np.array(degrees, dtype=np.float64)  # binary animations are memory-mapped: copy before rewriting
+
+    times, degrees, report = clean_recording(times, degrees, sigma=sigma, idle_threshold=idle_threshold,
+                                             duplicate_tolerance=duplicate_tolerance)
+
+    print(f"{os.path.basename(path)}: {report.frames_in} -> {report.frames_out} frames "
+          f"({report.frames_removed} removed)")
+    print(f"  Trimmed: {report.head_trimmed} head, {report.tail_trimmed} tail  "
+          f"Duplicates: {report.duplicates_removed}  Smoothing: max {report.max_smoothing_error:.2f}°")
+    print(f"  Duration: {report.duration_in:.2f}s -> {report.duration_out:.2f}s  "
+          f"Time to motion: {report.time_to_motion_in:.2f}s -> {report.time_to_motion_out:.2f}s")
+
+    if not dry_run:
+        # Frames are no longer evenly spaced, so the timestamps are always written
+        if path.endswith(ANIMATION_EXTENSION):
+            write_animation(path, joints, degrees, fps, timestamps=times, as_ticks=as_ticks)
+        else:
+            write_csv_recording(path, joints, times, degrees)
+        if os.path.exists(os.path.splitext(path)[0] + KEYFRAME_EXTENSION):
+            print("  Note: the cleaned take is now newer than the keyframe file and plays instead; "
+                  "rerun compress_recordings")
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Trim, smooth and de-duplicate recordings in place")
+    parser.add_argument('--name', type=str, help='Name of the recording to clean (default: all)')
+    parser.add_argument('--sigma', type=float, default=DEFAULT_SMOOTH_SIGMA,
+                        help=f'Gaussian smoothing width in frames, 0 disables (default: {DEFAULT_SMOOTH_SIGMA})')
+    parser.add_argument('--idle-threshold', type=float, default=DEFAULT_IDLE_THRESHOLD,
+                        help=f'Degrees from the rest pose that count as motion (default: {DEFAULT_IDLE_THRESHOLD})')
+    parser.add_argument('--duplicate-tolerance', type=float, default=DEFAULT_DUPLICATE_TOLERANCE,
+                        help=f'Degrees within which frames count as the same pose (default: {DEFAULT_DUPLICATE_TOLERANCE})')
+    parser.add_argument('--fps', type=int, default=30, help='Capture FPS when the recording has no timestamps (default: 30)')
+    parser.add_argument('--dry-run', action='store_true', help='Only report what would be removed')
+    args = parser.parse_args()
+
+    recordings_dir = os.path.join(os.path.dirname(__file__), "recordings")
+    sources = find_recordings(recordings_dir, SOURCE_EXTENSIONS)
+
+    names = [args.name] if args.name else sorted(sources)
+    if not names:
+        print(f"No recordings found in {recordings_dir}")
+        return
+
+    total_in = total_out = 0
+    for name in names:
+        if name not in sources:
+            print(f"Recording not found: {name}")
+            continue
+        report = clean_file(sources[name], sigma=args.sigma, idle_threshold=args.idle_threshold,
+                            duplicate_tolerance=args.duplicate_tolerance, default_fps=args.fps,
+                            dry_run=args.dry_run)
+        if report:
+            total_in += report.frames_in
+            total_out += report.frames_out
+
+    if total_in:
+        print(f"Total: {total_in} -> {total_out} frames ({total_in - total_out} removed, "
+              f"{(total_in - total_out) / total_in:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import argparse
+import os
+
+import numpy as np
+
+from .convert_recordings import estimate_fps
+from .service.motors.direct_motors_service import MOTOR_NAMES
+from .service.motors.keyframes import DEFAULT_TOLERANCE, KEYFRAME_EXTENSION, fit_keyframes, write_keyframes
+from .service.motors.playback import frame_times
+from .service.motors.recording_cache import SOURCE_EXTENSIONS, find_recordings, read_recording
+
+
+def compress_recording(path, tolerance=DEFAULT_TOLERANCE, default_fps=30, remove_source=False):
+    """Fit a recording with keyframe splines and write it next to the source."""
+    joints, timestamps, degrees = read_recording(path, MOTOR_NAMES)
+    if len(degrees) == 0:
+        print(f"{os.path.basename(path)}: no frames, skipped")
+        return None
+    fps = estimate_fps(timestamps, default_fps)
+    times = frame_times(timestamps, len(degrees), fps)
+    curves = fit_keyframes(joints, times, degrees, fps, tolerance=tolerance)
+
+    out_path = os.path.splitext(path)[0] + KEYFRAME_EXTENSION
+    write_keyframes(out_path, curves)
+
+    error = np.abs(curves.evaluate(times) - degrees).max() if len(joints) else 0.0
+    size = os.path.getsize(path)
+    out_size = os.path.getsize(out_path)
+    keys = ", ".join(f"{j} {len(t)}" for j, t in zip(curves.joints, curves.times))
+    print(f"{os.path.basename(path)} -> {os.path.basename(out_path)}")
+    print(f"  Frames: {len(degrees)}  Keys: {keys}")
+    print(f"  Max error: {error:.3f}°  Size: {size} -> {out_size} bytes ({size / max(out_size, 1):.1f}x smaller)")
+
+    if remove_source:
+        os.remove(path)
+    return out_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compress recordings to keyframe splines")
+    parser.add_argument('--name', type=str, help='Name of the recording to compress (default: all)')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help=f'Maximum deviation from the recording in degrees (default: {DEFAULT_TOLERANCE})')
+    parser.add_argument('--fps', type=int, default=30, help='Capture FPS when the recording has no timestamps (default: 30)')
+    parser.add_argument('--remove-source', action='store_true', help='Delete the source after a successful compression')
+    args = parser.parse_args()
+
+    recordings_dir = os.path.join(os.path.dirname(__file__), "recordings")
+    sources = find_recordings(recordings_dir, SOURCE_EXTENSIONS)
+
+    names = [args.name] if args.name else sorted(sources)
+    if not names:
+        print(f"No recordings found in {recordings_dir}")
+        return
+
+    for name in names:
+        if name not in sources:
+            print(f"Recording not found: {name}")
+            continue
+        compress_recording(sources[name], tolerance=args.tolerance, default_fps=args.fps,
+                           remove_source=args.remove_source)
+
+
+if __name__ == "__main__":
+    main()
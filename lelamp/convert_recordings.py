@@ -0,0 +1,68 @@
+import argparse
+import os
+import glob
+
+import numpy as np
+
+from .service.motors.animation_file import ANIMATION_EXTENSION, write_animation
+from .service.motors.direct_motors_service import MOTOR_NAMES
+from .service.motors.recording_cache import read_csv_recording
+
+
+def estimate_fps(timestamps, default_fps):
+    """Estimate the capture rate from recorded timestamps (median frame interval)"""
+    if timestamps is None or len(timestamps) < 2:
+        return default_fps
+    dt = np.diff(timestamps)
+    dt = dt[dt > 0]
+    if len(dt) == 0:
+        return default_fps
+    return float(1.0 / np.median(dt))
+
+
+def convert_recording(csv_path, as_ticks=False, default_fps=30, remove_csv=False):
+    """Convert a single CSV recording to the binary animation format."""
+    joints, timestamps, degrees = read_csv_recording(csv_path, MOTOR_NAMES)
+    fps = estimate_fps(timestamps, default_fps)
+
+    out_path = os.path.splitext(csv_path)[0] + ANIMATION_EXTENSION
+    write_animation(out_path, joints, degrees, fps, timestamps=timestamps, as_ticks=as_ticks)
+
+    csv_size = os.path.getsize(csv_path)
+    out_size = os.path.getsize(out_path)
+    print(f"{os.path.basename(csv_path)} -> {os.path.basename(out_path)}")
+    print(f"  Frames: {len(degrees)}  FPS: {fps:.1f}")
+    print(f"  Size: {csv_size} -> {out_size} bytes ({out_size / max(csv_size, 1):.0%})")
+
+    if remove_csv:
+        os.remove(csv_path)
+    return out_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert CSV recordings to the binary animation format")
+    parser.add_argument('--name', type=str, help='Name of the recording to convert (default: all)')
+    parser.add_argument('--ticks', action='store_true', help='Store int16 servo ticks instead of float32 degrees')
+    parser.add_argument('--fps', type=int, default=30, help='FPS to store when the CSV has no timestamps (default: 30)')
+    parser.add_argument('--remove-csv', action='store_true', help='Delete the CSV after a successful conversion')
+    args = parser.parse_args()
+
+    recordings_dir = os.path.join(os.path.dirname(__file__), "recordings")
+    if args.name:
+        csv_files = [os.path.join(recordings_dir, f"{args.name}.csv")]
+    else:
+        csv_files = sorted(glob.glob(os.path.join(recordings_dir, "*.csv")))
+
+    if not csv_files:
+        print(f"No CSV recordings found in {recordings_dir}")
+        return
+
+    for csv_path in csv_files:
+        if not os.path.exists(csv_path):
+            print(f"Recording not found: {csv_path}")
+            continue
+        convert_recording(csv_path, as_ticks=args.ticks, default_fps=args.fps, remove_csv=args.remove_csv)
+
+
+if __name__ == "__main__":
+    main()
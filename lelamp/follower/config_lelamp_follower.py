@@ -34,6 +34,12 @@ class LeLampFollowerConfig(RobotConfig):
     # the number of motors in your follower arms.
     max_relative_target: int | None = None
 
+    # With max_relative_target set, present positions are refreshed in the background at this
+    # rate and actions are clamped against that snapshot. A snapshot older than
+    # present_position_max_age (seconds) is replaced by a synchronous read first.
+    present_position_rate: float = 50.0
+    present_position_max_age: float = 0.05
+
     # cameras
     cameras: dict[str, CameraConfig] = field(default_factory=dict)
 
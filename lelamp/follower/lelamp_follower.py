@@ -15,7 +15,10 @@
 # limitations under the License.
 
 import logging
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from functools import cached_property
 from typing import Any
 
@@ -34,6 +37,23 @@ from .config_lelamp_follower import LeLampFollowerConfig
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class ObservationBundle:
+    """One observation whose sources were read concurrently"""
+
+    timestamp: float                                    # perf_counter when the reads were issued
+    values: dict[str, Any] = field(default_factory=dict)
+    source_times: dict[str, float] = field(default_factory=dict)  # perf_counter when each source returned
+    latency_ms: dict[str, float] = field(default_factory=dict)
+
+    @property
+    def skew_ms(self) -> float:
+        """Spread between the first and last source to return"""
+        if not self.source_times:
+            return 0.0
+        return (max(self.source_times.values()) - min(self.source_times.values())) * 1e3
+
+
 class LeLampFollower(Robot):
     """
     LeLamp Follower Arm designed by TheRobotStudio and Hugging Face.
@@ -60,6 +80,17 @@ class LeLampFollower(Robot):
 
         self.cameras = make_cameras_from_configs(self.config.cameras)
 
+        # Serializes bus transactions between the position refresher and the caller
+        self._bus_lock = threading.Lock()
+        self._present_pos: dict[str, float] | None = None
+        self._present_time = 0.0
+        self._refresher: threading.Thread | None = None
+        self._refreshing = threading.Event()
+        self.stale_reads = 0  # actions that had to wait for a synchronous read
+        # Motor and camera reads of an observation run side by side
+        self._observation_pool: ThreadPoolExecutor | None = None
+        self.last_observation: ObservationBundle | None = None
+
     @property
     def _motors_ft(self) -> dict[str, type]:
         return {f"{motor}.pos": float for motor in self.bus.motors}
@@ -102,8 +133,13 @@ class LeLampFollower(Robot):
 
         for cam in self.cameras.values():
             cam.connect()
+        self._observation_pool = ThreadPoolExecutor(
+            max_workers=1 + len(self.cameras), thread_name_prefix="lelamp_observation"
+        )
 
         self.configure()
+        if self.config.max_relative_target is not None:
+            self._start_position_refresher()
         logger.info(f"{self} connected.")
 
     @property
@@ -160,35 +196,82 @@ class LeLampFollower(Robot):
                 self.bus.write("I_Coefficient", motor, 0)
                 self.bus.write("D_Coefficient", motor, 32)
 
+    def _start_position_refresher(self) -> None:
+        self._refreshing.set()
+        self._refresher = threading.Thread(target=self._refresh_positions, daemon=True)
+        self._refresher.start()
+
+    def _stop_position_refresher(self) -> None:
+        self._refreshing.clear()
+        if self._refresher is not None:
+            self._refresher.join(timeout=1.0)
+            self._refresher = None
+
+    def _read_present_position(self) -> dict[str, float]:
+        with self._bus_lock:
+            present_pos = self.bus.sync_read("Present_Position")
+        self._present_pos, self._present_time = present_pos, time.perf_counter()
+        return present_pos
+
+    def _refresh_positions(self) -> None:
+        period = 1.0 / self.config.present_position_rate
+        while self._refreshing.is_set():
+            start = time.perf_counter()
+            try:
+                self._read_present_position()
+            except Exception as e:
+                logger.warning(f"{self} present position refresh failed: {e}")
+            time.sleep(max(0.0, period - (time.perf_counter() - start)))
+
+    def _present_position(self) -> dict[str, float]:
+        """Latest present positions, read synchronously only if the snapshot is too old"""
+        present_pos = self._present_pos
+        if present_pos is None or time.perf_counter() - self._present_time > self.config.present_position_max_age:
+            self.stale_reads += 1
+            present_pos = self._read_present_position()
+        return present_pos
+
     def setup_motors(self) -> None:
         for motor in reversed(self.bus.motors):
             input(f"Connect the controller board to the '{motor}' motor only and press enter.")
             self.bus.setup_motor(motor)
             print(f"'{motor}' motor id set to {self.bus.motors[motor].id}")
 
-    def get_observation(self) -> dict[str, Any]:
+    def _read_motors(self) -> dict[str, Any]:
+        return {f"{motor}.pos": val for motor, val in self._read_present_position().items()}
+
+    @staticmethod
+    def _timed(read) -> tuple[Any, float]:
+        value = read()
+        return value, time.perf_counter()
+
+    def capture_observation(self) -> ObservationBundle:
+        """Read the motors and every camera concurrently"""
         if not self.is_connected:
             raise DeviceNotConnectedError(f"{self} is not connected.")
 
-        # Read arm position
         start = time.perf_counter()
-        obs_dict = self.bus.sync_read("Present_Position")
-        obs_dict = {f"{motor}.pos": val for motor, val in obs_dict.items()}
-        dt_ms = (time.perf_counter() - start) * 1e3
-        logger.debug(f"{self} read state: {dt_ms:.1f}ms")
-
-        # Capture images from cameras
+        futures = {"motors": self._observation_pool.submit(self._timed, self._read_motors)}
         for cam_key, cam in self.cameras.items():
-            start = time.perf_counter()
-            obs_dict[cam_key] = cam.async_read()
-            dt_ms = (time.perf_counter() - start) * 1e3
-            logger.debug(f"{self} read {cam_key}: {dt_ms:.1f}ms")
+            futures[cam_key] = self._observation_pool.submit(self._timed, cam.async_read)
+
+        bundle = ObservationBundle(timestamp=start)
+        for source, future in futures.items():
+            value, done = future.result()
+            if source == "motors":
+                bundle.values.update(value)
+            else:
+                bundle.values[source] = value
+            bundle.source_times[source] = done
+            bundle.latency_ms[source] = (done - start) * 1e3
+
+        latencies = ", ".join(f"{source} {ms:.1f}ms" for source, ms in bundle.latency_ms.items())
+        logger.debug(f"{self} observation: {latencies} (skew {bundle.skew_ms:.1f}ms)")
+        self.last_observation = bundle
+        return bundle
 
-        # Read LEDs
-        start = time.perf_counter()
-        dt_ms = (time.perf_counter() - start) * 1e3
-        logger.debug(f"{self} read LEDs: {dt_ms:.1f}ms")
-        return obs_dict
+    def get_observation(self) -> dict[str, Any]:
+        return self.capture_observation().values
 
     def send_action(self, action: dict[str, Any]) -> dict[str, Any]:
         """Command arm to move to a target joint configuration.
@@ -208,22 +291,27 @@ class LeLampFollower(Robot):
 
         goal_pos = {key.removesuffix(".pos"): val for key, val in action.items() if key.endswith(".pos")}
 
-        # Cap goal position when too far away from present position.
-        # /!\ Slower fps expected due to reading from the follower.
+        # Cap goal position when too far away from present position. Present positions
+        # come from the background refresher, so this normally costs no bus read.
         if self.config.max_relative_target is not None:
-            present_pos = self.bus.sync_read("Present_Position")
+            present_pos = self._present_position()
             goal_present_pos = {key: (g_pos, present_pos[key]) for key, g_pos in goal_pos.items()}
             goal_pos = ensure_safe_goal_position(goal_present_pos, self.config.max_relative_target)
 
 
         # Send goal position to the arm
-        self.bus.sync_write("Goal_Position", goal_pos)
+        with self._bus_lock:
+            self.bus.sync_write("Goal_Position", goal_pos)
         return {f"{motor}.pos": val for motor, val in goal_pos.items()}
 
     def disconnect(self):
         if not self.is_connected:
             raise DeviceNotConnectedError(f"{self} is not connected.")
 
+        self._stop_position_refresher()
+        if self._observation_pool is not None:
+            self._observation_pool.shutdown(wait=True)
+            self._observation_pool = None
         self.bus.disconnect(self.config.disable_torque_on_disconnect)
         for cam in self.cameras.values():
             cam.disconnect()
@@ -1,60 +1,54 @@
 import argparse
 import os
-import glob
-import csv
 from datetime import datetime
 
+from .service.motors.direct_motors_service import MOTOR_NAMES
+from .service.motors.recording_catalog import RecordingCatalog
 
-def list_recordings(lamp_id):
+
+def list_recordings(lamp_id, verbose=False):
     """List all recordings for a given lamp ID."""
     # Get the recordings directory path
     recordings_dir = os.path.join(os.path.dirname(__file__), "recordings")
-    
+
     if not os.path.exists(recordings_dir):
         print(f"No recordings directory found at {recordings_dir}")
         return
-    
-    # Pattern to match recordings for the specific lamp ID
-    pattern = os.path.join(recordings_dir, f"*.csv")
-    recording_files = glob.glob(pattern)
-    
-    if not recording_files:
+
+    # Only new or modified recordings are read; the rest comes from the manifest
+    catalog = RecordingCatalog(recordings_dir, MOTOR_NAMES)
+    catalog.refresh()
+    recordings = catalog.entries()
+
+    if not recordings:
         print(f"No recordings found for lamp ID: {lamp_id}")
         return
-    
+
     print(f"Recordings for lamp ID '{lamp_id}':")
     print()
-    
-    for file_path in sorted(recording_files):
-        filename = os.path.basename(file_path)
-        # Extract recording name by removing the lamp_id suffix
-        recording_name = filename.replace(f".csv", "")
-        
-        # Count rows in CSV file
-        try:
-            with open(file_path, 'r') as csvfile:
-                reader = csv.reader(csvfile)
-                row_count = sum(1 for row in reader) - 1  # Subtract header row
-        except Exception as e:
-            row_count = "Error reading file"
-        
-        # Get modified time
-        stat = os.stat(file_path)
-        modified_time = datetime.fromtimestamp(stat.st_mtime)
-        
-        print(f"{recording_name}")
-        print(f"  File: {filename}")
-        print(f"  Rows: {row_count}")
+
+    for info in recordings:
+        modified_time = datetime.fromtimestamp(info.mtime)
+
+        print(f"{info.name}")
+        print(f"  File: {info.filename}")
+        print(f"  Frames: {info.frames} ({info.duration:.1f}s at {info.fps:.0f} fps)")
+        print(f"  Modified: {modified_time:%Y-%m-%d %H:%M:%S}")
+        if verbose:
+            for joint, (low, high) in info.joints.items():
+                print(f"    {joint}: {low:.1f}° .. {high:.1f}°")
+            print(f"  SHA1: {info.checksum}")
         print()
 
 
 def main():
     parser = argparse.ArgumentParser(description="List recordings for a specific lamp ID")
     parser.add_argument('--id', type=str, required=True, help='ID of the lamp to list recordings for')
+    parser.add_argument('--verbose', action='store_true', help='Show joint ranges and checksums')
     args = parser.parse_args()
-    
-    list_recordings(args.id)
+
+    list_recordings(args.id, verbose=args.verbose)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
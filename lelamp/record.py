@@ -1,9 +1,16 @@
 import argparse
 import time
-import csv
 import os
 from .leader import LeLampLeader, LeLampLeaderConfig
+from .service.motors.sample_recorder import BufferedRecorder, recording_path
 from lerobot.utils.robot_utils import busy_wait
+
+
+def print_recorder_stats(stats, fps):
+    print(f"Recorded {stats.written} samples in {stats.batches} batches")
+    print(f"  Dropped: {stats.dropped}  Late (>{1.5e3 / fps:.1f}ms apart): {stats.late}  "
+          f"Longest gap: {stats.max_gap_ms:.1f}ms  Peak backlog: {stats.max_backlog}")
+
   
 def main():
     parser = argparse.ArgumentParser(description="Check motors status and position")
@@ -11,6 +18,9 @@ def main():
     parser.add_argument('--port', type=str, required=True, help='Serial port for the lamp')
     parser.add_argument('--name', type=str, help='Name of recording')
     parser.add_argument('--fps', type=int, default=30, help='Frames per second for recording (default: 30)')
+    parser.add_argument('--format', choices=['csv', 'anim'], default='csv',
+                        help='csv, or the compact binary animation format (default: csv)')
+    parser.add_argument('--buffer', type=int, default=8192, help='Samples buffered ahead of the disk writer (default: 8192)')
     args = parser.parse_args()
 
     leader_config = LeLampLeaderConfig(
@@ -27,39 +37,37 @@ def main():
     # Create recordings directory if it doesn't exist
     recordings_dir = os.path.join(os.path.dirname(__file__), "recordings")
     os.makedirs(recordings_dir, exist_ok=True)
+    path = recording_path(recordings_dir, args.name or 'recording', args.format)
 
-    # Set up CSV file for recording
-    csv_filename = os.path.join(recordings_dir, f"{args.name or 'recording'}.csv")
-    with open(csv_filename, 'w', newline='') as csvfile:
-        csv_writer = None
-        
-        while True:
-            try:
-                t0 = time.perf_counter()
-                obs = leader.get_action()
-                
-                # Initialize CSV writer with headers based on first observation
-                if csv_writer is None:
-                    fieldnames = ['timestamp'] + list(obs.keys()) if isinstance(obs, dict) else ['timestamp', 'observation']
-                    csv_writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                    csv_writer.writeheader()
-                
-                # Write observation to CSV
-                if isinstance(obs, dict):
-                    row = {'timestamp': t0, **obs}
-                else:
-                    row = {'timestamp': t0, 'observation': obs}
-                csv_writer.writerow(row)
-                csvfile.flush()
-                
+    # The loop only copies samples into a ring buffer; a background thread writes them out
+    recorder = None
+    last_status = time.perf_counter()
+    while True:
+        try:
+            t0 = time.perf_counter()
+            obs = leader.get_action()
+            
+            # Columns are fixed by the first observation
+            if recorder is None:
+                recorder = BufferedRecorder(path, list(obs.keys()), fmt=args.format, fps=args.fps,
+                                            capacity=args.buffer)
+                recorder.start()
+            recorder.push(t0, [obs[key] for key in recorder.fields])
+            
+            if t0 - last_status >= 1.0:
+                last_status = t0
                 print(obs)
-                
-                # Enforce FPS with busy wait
-                busy_wait(1.0 / args.fps - (time.perf_counter() - t0))
-                
-            except KeyboardInterrupt:
-                print("Shutting down teleop...")
-                break
+            
+            # Enforce FPS with busy wait
+            busy_wait(1.0 / args.fps - (time.perf_counter() - t0))
+            
+        except KeyboardInterrupt:
+            print("Shutting down teleop...")
+            break
+
+    if recorder is not None:
+        print_recorder_stats(recorder.close(), args.fps)
+        print(f"Saved {path}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,43 +1,43 @@
 import argparse
-import csv
 import time
 import os
 
 from .follower import LeLampFollowerConfig, LeLampFollower
+from .service.motors.direct_motors_service import MOTOR_NAMES
+from .service.motors.playback import frame_times
+from .service.motors.recording_cache import find_recording, read_recording
 from lerobot.utils.robot_utils import busy_wait
 
 def main():
-    parser = argparse.ArgumentParser(description="Replay recorded actions from CSV file")
+    parser = argparse.ArgumentParser(description="Replay recorded actions from a CSV or binary animation file")
     parser.add_argument('--name', type=str, required=True, help='Name of the recording to replay')
     parser.add_argument('--port', type=str, required=True, help='Serial port for the robot')
     parser.add_argument('--id', type=str, required=True, help='ID of the robot')
-    parser.add_argument('--fps', type=int, default=30, help='Frames per second for replay (default: 30)')
+    parser.add_argument('--fps', type=int, default=30, help='Frames per second for recordings without timestamps (default: 30)')
     args = parser.parse_args()
 
     robot_config = LeLampFollowerConfig(port=args.port, id=args.id)
     robot = LeLampFollower(robot_config)
     robot.connect(calibrate=False)
 
-    # Build CSV filename from name and lamp ID
+    # Find the file the lamp would play: the newest one of the recording
     recordings_dir = os.path.join(os.path.dirname(__file__), "recordings")
-    csv_filename = f"{args.name}.csv"
-    csv_path = os.path.join(recordings_dir, csv_filename)
+    recording_path = find_recording(recordings_dir, args.name) or os.path.join(recordings_dir, f"{args.name}.csv")
 
-    # Read CSV file and replay actions
-    with open(csv_path, 'r') as csvfile:
-        csv_reader = csv.DictReader(csvfile)
-        actions = list(csv_reader)
+    # Binary animations are memory-mapped, so frames stream from disk as they are replayed
+    joints, timestamps, degrees = read_recording(recording_path, MOTOR_NAMES)
+    keys = [f"{name}.pos" for name in joints]
+    # Honour recorded timestamps (cleaned recordings are not evenly spaced); fall back to --fps
+    times = frame_times(timestamps, len(degrees), args.fps)
     
-    print(f"Replaying {len(actions)} actions from {csv_path}")
+    print(f"Replaying {len(degrees)} actions from {recording_path}")
     
-    for row in actions:
-        t0 = time.perf_counter()
+    start = time.perf_counter()
+    for t, frame in zip(times.tolist(), degrees):
+        busy_wait(start + t - time.perf_counter())
         
-        # Extract action data (exclude timestamp column)
-        action = {key: float(value) for key, value in row.items() if key != 'timestamp'}
+        action = dict(zip(keys, frame.tolist()))
         robot.send_action(action)
-        
-        busy_wait(1.0 / args.fps - (time.perf_counter() - t0))
     
     robot.disconnect()
 
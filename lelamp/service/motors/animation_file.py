@@ -0,0 +1,125 @@
+"""
+Compact binary animation format for LeLamp recordings
+
+Layout (little endian):
+    header      28 bytes, see _HEADER
+    joint names UTF-8, comma separated
+    matrix      frames x joints, int16 ticks or float32 degrees (16-byte aligned)
+    timestamps  frames float32 seconds from the first frame (optional, 16-byte aligned)
+
+The matrix and timestamps are opened with numpy.memmap, so loading a file
+only reads the header and frames are streamed from the page cache on demand.
+Stored values are multiplied by the header scale to get degrees.
+"""
+import os
+import struct
+import tempfile
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+
+ANIMATION_EXTENSION = ".anim"
+
+MAGIC = b"LLAN"
+VERSION = 1
+
+DTYPE_FLOAT32 = 0  # degrees
+DTYPE_INT16 = 1    # servo ticks, 4096 per turn
+_DTYPES = {DTYPE_FLOAT32: np.dtype("<f4"), DTYPE_INT16: np.dtype("<i2")}
+TICK_SCALE = 180.0 / 2048  # degrees per tick
+
+FLAG_TIMESTAMPS = 0x01
+
+# magic, version, dtype, flags, fps, scale, frames, joints, names_len, data_offset
+_HEADER = struct.Struct("<4sHBBffIHHI")
+_ALIGN = 16
+
+
+def _align(offset: int) -> int:
+    return (offset + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+@dataclass
+class AnimationFile:
+    """Memory-mapped view of a binary animation"""
+    joints: List[str]
+    fps: float
+    scale: float
+    values: np.ndarray                  # (frames, joints) raw stored values
+    timestamps: Optional[np.ndarray]    # (frames,) seconds from first frame
+
+    @property
+    def frame_count(self) -> int:
+        return len(self.values)
+
+    def degrees(self) -> np.ndarray:
+        """Joint angles in degrees (a view when stored as float32 degrees)"""
+        if self.scale == 1.0 and self.values.dtype == np.float32:
+            return self.values
+        return self.values * self.scale
+
+
+def write_animation(path: str, joints: List[str], degrees: np.ndarray, fps: float,
+                    timestamps: Optional[np.ndarray] = None, as_ticks: bool = False):
+    """Write a (frames, joints) degree matrix to a binary animation file"""
+    degrees = np.asarray(degrees, dtype=np.float64).reshape(-1, len(joints))
+    if as_ticks:
+        dtype_code, scale = DTYPE_INT16, TICK_SCALE
+        values = np.clip(np.round(degrees / scale), -32768, 32767)
+    else:
+        dtype_code, scale = DTYPE_FLOAT32, 1.0
+        values = degrees
+    values = np.ascontiguousarray(values, dtype=_DTYPES[dtype_code])
+
+    names = ",".join(joints).encode("utf-8")
+    flags = FLAG_TIMESTAMPS if timestamps is not None else 0
+    data_offset = _align(_HEADER.size + len(names))
+    header = _HEADER.pack(MAGIC, VERSION, dtype_code, flags, float(fps), scale,
+                          len(values), len(joints), len(names), data_offset)
+
+    # Write beside the target and swap it in: the old file may be memory-mapped
+    # (recording cache, replay), and truncating a mapped file faults its readers.
+    # The temp file is our own, so two writers of one recording never share it.
+    directory, name = os.path.split(os.path.abspath(path))
+    with tempfile.NamedTemporaryFile("wb", dir=directory, prefix=name, suffix=".tmp", delete=False) as f:
+        tmp = f.name
+        f.write(header)
+        f.write(names)
+        f.write(b"\0" * (data_offset - f.tell()))
+        f.write(values.tobytes())
+        if timestamps is not None:
+            rel = np.asarray(timestamps, dtype=np.float64)
+            rel = (rel - rel[0]) if len(rel) else rel
+            f.write(b"\0" * (_align(f.tell()) - f.tell()))
+            f.write(np.ascontiguousarray(rel, dtype="<f4").tobytes())
+    os.replace(tmp, path)
+
+
+def read_animation(path: str) -> AnimationFile:
+    """Open a binary animation file as memory-mapped arrays"""
+    with open(path, "rb") as f:
+        raw = f.read(_HEADER.size)
+        if len(raw) < _HEADER.size:
+            raise ValueError(f"Truncated animation header: {path}")
+        (magic, version, dtype_code, flags, fps, scale,
+         frames, joint_count, names_len, data_offset) = _HEADER.unpack(raw)
+        if magic != MAGIC:
+            raise ValueError(f"Not a LeLamp animation file: {path}")
+        if version != VERSION or dtype_code not in _DTYPES:
+            raise ValueError(f"Unsupported animation version {version} / dtype {dtype_code}: {path}")
+        names = f.read(names_len).decode("utf-8")
+
+    joints = names.split(",") if names else []
+    dtype = _DTYPES[dtype_code]
+    if frames == 0:
+        values = np.empty((0, joint_count), dtype=dtype)
+        timestamps = np.empty(0, dtype="<f4") if flags & FLAG_TIMESTAMPS else None
+        return AnimationFile(joints, fps, scale, values, timestamps)
+
+    values = np.memmap(path, dtype=dtype, mode="r", offset=data_offset, shape=(frames, joint_count))
+    timestamps = None
+    if flags & FLAG_TIMESTAMPS:
+        ts_offset = _align(data_offset + values.nbytes)
+        timestamps = np.memmap(path, dtype="<f4", mode="r", offset=ts_offset, shape=(frames,))
+    return AnimationFile(joints, fps, scale, values, timestamps)
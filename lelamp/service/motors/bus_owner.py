@@ -0,0 +1,193 @@
+"""
+Servo bus arbitration for DirectMotorsService
+
+Every motion source (idle, animation, tracking) claims goal positions for
+the joints it wants to drive. A single writer thread merges the claims per
+joint by priority and writes one frame to the bus, so packets from different
+threads can never interleave on the wire. With a PoseCompositor the claims
+are blended as weighted layers instead (see compositor.py). With a keyframe
+callback the writer also calls it whenever nothing was written for
+keyframe_interval seconds, e.g. to refresh the goals the servos hold.
+"""
+import time
+import threading
+import logging
+from typing import Callable, Dict, Optional, Set, Tuple, Union
+
+from ..base import Priority
+from .compositor import PoseCompositor
+
+logger = logging.getLogger(__name__)
+
+
+class BusOwner:
+    """Single writer for the servo bus, merging per-joint claims by priority"""
+
+    def __init__(self, write_frame: Callable[..., Optional[bool]], max_rate: float = 100.0,
+                 compositor: Optional[PoseCompositor] = None,
+                 keyframe: Optional[Callable[[], None]] = None, keyframe_interval: float = 0.0):
+        self.write_frame = write_frame
+        self.max_rate = max_rate
+        self.compositor = compositor
+        self.keyframe = keyframe
+        self.keyframe_interval = keyframe_interval
+        # Serial port lock: held for every transaction on the bus, by the writer
+        # thread and by anything else that talks to the servos (torque, reads)
+        self.lock = threading.RLock()
+
+        self._claims: Dict[str, Tuple[int, float, Dict[int, int]]] = {}
+        self._packets: Dict[str, Union[bytes, memoryview]] = {}  # pre-encoded wire bytes per claim
+        self._releasing: Set[str] = set()
+        self._cond = threading.Condition()
+        self._dirty = False
+        self._writing = False  # a frame is being written (or still converging)
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+        self._last_write = 0.0
+
+        self.frames_written = 0
+        self.claims_received = 0
+        self.keyframes_written = 0
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._writer_loop, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 1.0):
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=timeout)
+
+    def claim(self, source: str, goals: Dict[int, int], priority: Priority = Priority.NORMAL,
+              packet: Optional[Union[bytes, memoryview]] = None):
+        """Replace the goals claimed by source and wake the writer
+
+        packet optionally holds the pre-encoded goal frame for exactly these
+        goals; it is written as-is when this claim wins every joint.
+        """
+        with self._cond:
+            self._claims[source] = (int(priority), time.monotonic(), dict(goals))
+            if packet is not None:
+                self._packets[source] = packet
+            else:
+                self._packets.pop(source, None)
+            self._releasing.discard(source)
+            self.claims_received += 1
+            self._dirty = True
+            self._cond.notify()
+
+    def release(self, source: str):
+        """Drop all claims of source. A claim not yet written (or not yet
+        reached, see write_frame) is flushed first."""
+        with self._cond:
+            if source not in self._claims:
+                return
+            if self._dirty or self._writing:
+                self._releasing.add(source)
+            else:
+                del self._claims[source]
+                self._packets.pop(source, None)
+
+    def has_claim(self, source: str) -> bool:
+        """True while source holds claims it has not released"""
+        with self._cond:
+            return source in self._claims and source not in self._releasing
+
+    def merged_frame(self) -> Dict[int, int]:
+        """Goal per joint: highest priority claim, newest on a tie, or the composited layers"""
+        with self._cond:
+            return self._merge()
+
+    def _merge(self) -> Dict[int, int]:
+        if self.compositor is not None:
+            return self.compositor.compose(self._claims)
+        frame: Dict[int, int] = {}
+        winners: Dict[int, Tuple[int, float]] = {}
+        for priority, stamp, goals in self._claims.values():
+            rank = (priority, -stamp)
+            for motor_id, position in goals.items():
+                if motor_id not in winners or rank < winners[motor_id]:
+                    winners[motor_id] = rank
+                    frame[motor_id] = position
+        return frame
+
+    def _whole_frame_packet(self, frame: Dict[int, int]):
+        """Pre-encoded packet of the claim that supplies the whole merged frame, if any"""
+        for source, packet in self._packets.items():
+            if self._claims[source][2] == frame:
+                return packet
+        return None
+
+    def _keyframe_due(self) -> Optional[float]:
+        """Seconds until the next keyframe refresh (<= 0: due), None without one"""
+        if self.keyframe is None or self.keyframe_interval <= 0:
+            return None
+        return self._last_write + self.keyframe_interval - time.monotonic()
+
+    def _writer_loop(self):
+        min_interval = 1.0 / self.max_rate if self.max_rate > 0 else 0.0
+        while True:
+            with self._cond:
+                refresh = False
+                while self._running and not self._dirty:
+                    wait = self._keyframe_due()
+                    if wait is not None and wait <= 0:
+                        refresh = True
+                        break
+                    self._cond.wait(wait)
+                if not self._running:
+                    return
+
+            if refresh:
+                # Nothing was written for a while: let the owner refresh the servos
+                try:
+                    with self.lock:
+                        self.keyframe()
+                    self.keyframes_written += 1
+                except Exception as e:
+                    logger.error(f"Keyframe refresh failed: {e}")
+                self._last_write = time.monotonic()
+                continue
+
+            # Rate limit; claims arriving meanwhile are merged into this frame
+            wait = self._last_write + min_interval - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+
+            with self._cond:
+                frame = self._merge()
+                packet = self._whole_frame_packet(frame)
+                self._dirty = False
+                self._writing = True
+
+            done = None
+            if frame:
+                try:
+                    with self.lock:
+                        if packet is not None:
+                            done = self.write_frame(frame, packet)
+                        else:
+                            done = self.write_frame(frame)
+                    self.frames_written += 1
+                except Exception as e:
+                    logger.error(f"Bus write failed: {e}")
+            self._last_write = time.monotonic()
+
+            with self._cond:
+                self._writing = False
+                if done is False:
+                    # write_frame limited the frame short of its goals: keep
+                    # writing (released claims included) until they are reached
+                    self._dirty = True
+                    continue
+                if self._dirty:
+                    continue  # newer claims arrived: released sources go out with them
+                for source in self._releasing:
+                    self._claims.pop(source, None)
+                    self._packets.pop(source, None)
+                self._releasing.clear()
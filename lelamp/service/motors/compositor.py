@@ -0,0 +1,101 @@
+"""
+Layered pose compositor for the motor bus
+
+Every motion source is a layer on top of a base pose (home). Override
+layers (animation, gaze tracking) pull their joints toward their pose by
+weight x mask; additive layers (idle breathing, an emotion gesture played
+on top of tracking) add their offset from a reference pose. The whole
+stack is blended in one vectorized step per frame:
+
+    override  result = base * prod(1 - w_i) + sum_i pose_i * w_i * prod_{k>i} (1 - w_k)
+    additive  result += sum_j w_j * (pose_j - reference_j) * prod_{k>j} (1 - w_k)
+
+Layers are stacked by priority, newest last on a tie, so with full
+weights the winner per joint is the same as plain priority arbitration:
+an additive layer is covered by the overrides above it on the joints
+they hold (idle adds nothing to an animation). An additive layer marked
+on_top is applied above every override instead (a gesture on tracking).
+Joints no layer claims are left out of the frame (the servo holds them).
+"""
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+OVERRIDE = "override"
+ADDITIVE = "additive"
+
+
+@dataclass
+class LayerConfig:
+    mode: str = OVERRIDE
+    weight: float = 1.0
+    mask: Optional[Dict[int, float]] = None         # per-joint weight (default 1)
+    reference: Optional[Dict[int, float]] = None    # additive: pose that means "no offset" (default base)
+    on_top: bool = False                            # additive: not covered by higher-priority overrides
+
+
+class PoseCompositor:
+    """Blends per-source claims {source: (priority, stamp, goals)} into one goal frame"""
+
+    def __init__(self, motor_ids: Iterable[int]):
+        self.motor_ids = list(motor_ids)
+        self._column = {motor_id: j for j, motor_id in enumerate(self.motor_ids)}
+        self.base = np.full(len(self.motor_ids), 2048.0)
+        self.layers: Dict[str, LayerConfig] = {}
+
+    def set_base(self, pose: Iterable[float]):
+        """Base pose (ticks, ordered like motor_ids) the layers are applied to"""
+        self.base = np.asarray(list(pose), dtype=np.float64)
+
+    def configure(self, source: str, mode: str = OVERRIDE, weight: float = 1.0,
+                  mask: Optional[Dict[int, float]] = None, reference: Optional[Dict[int, float]] = None,
+                  on_top: bool = False):
+        if mode not in (OVERRIDE, ADDITIVE):
+            raise ValueError(f"Unknown layer mode: {mode}")
+        self.layers[source] = LayerConfig(mode, weight, mask, reference, on_top)
+
+    def _row(self, values: Dict[int, float], default: float) -> np.ndarray:
+        row = np.full(len(self.motor_ids), default)
+        for motor_id, value in values.items():
+            j = self._column.get(motor_id)
+            if j is not None:
+                row[j] = value
+        return row
+
+    def compose(self, claims: Dict[str, Tuple[int, float, Dict[int, int]]]) -> Dict[int, int]:
+        if not claims:
+            return {}
+        # Lowest priority first so the most important override is applied last
+        order = sorted(claims, key=lambda s: (-claims[s][0], claims[s][1]))
+        n = len(order)
+        joints = len(self.motor_ids)
+        poses = np.zeros((n, joints))
+        weights = np.zeros((n, joints))
+        refs = np.zeros((n, joints))
+        additive = np.zeros(n, dtype=bool)
+        on_top = np.zeros(n, dtype=bool)
+        default = LayerConfig()
+        for i, source in enumerate(order):
+            goals = claims[source][2]
+            layer = self.layers.get(source, default)
+            claimed = self._row({m: 1.0 for m in goals}, 0.0)
+            mask = self._row(layer.mask, 1.0) if layer.mask else 1.0
+            poses[i] = self._row(goals, 0.0)
+            weights[i] = claimed * mask * layer.weight
+            additive[i] = layer.mode == ADDITIVE
+            on_top[i] = additive[i] and layer.on_top
+            if additive[i]:
+                refs[i] = self._row(layer.reference, np.nan) if layer.reference else self.base
+                refs[i] = np.where(np.isnan(refs[i]), self.base, refs[i])
+
+        over_w = np.where(additive[:, None], 0.0, weights)
+        # keep[i] = prod_{k>i} (1 - w_k): how much of layer i survives the layers above it
+        keep = np.cumprod(np.vstack([np.ones(joints), (1.0 - over_w)[::-1]]), axis=0)[::-1]
+        result = self.base * keep[0] + (poses * over_w * keep[1:]).sum(axis=0)
+        add_w = np.where(additive[:, None], weights, 0.0) * np.where(on_top[:, None], 1.0, keep[1:])
+        result += (add_w * (poses - refs)).sum(axis=0)
+
+        present = (weights > 0).any(axis=0)
+        ticks = np.clip(np.rint(result), 0, 4095).astype(np.int32)
+        return {self.motor_ids[j]: int(ticks[j]) for j in np.flatnonzero(present)}
@@ -4,16 +4,35 @@ Uses raw serial protocol for Feetech STS3215 servos
 Supports position offsets so current position can be treated as 0°
 """
 import os
-import csv
 import json
 import time
 import serial
 import threading
 import logging
-from typing import Any, List
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from ..base import Priority
+from .bus_owner import BusOwner
+from .compositor import ADDITIVE, OVERRIDE, PoseCompositor
+from .idle_motion import IdleEngine
+from .motion_limits import JointLimits, MotionLimiter
+from .motion_queue import MotionQueue
+from .packet_encoder import EncodedFrames, PositionWriteEncoder, SyncWriteEncoder, encode_goal_frames
+from .recording_cache import RecordingCache
+from .recording_catalog import RecordingCatalog
+from .status_reader import StatusReader
+from .telemetry import TelemetryReader
+from .tracking_metrics import TrackingRecorder, TrackingSummary
+from .playback import PlaybackScheduler, PlaybackStats, frame_times, time_warp, warp_times
+from .trajectory import blend_poses, crossfade
 
 logger = logging.getLogger(__name__)
 
+# Joint names in servo id order (id 1 first); shared with the recording tools
+MOTOR_NAMES = ['base_yaw', 'base_pitch', 'elbow_pitch', 'wrist_roll', 'wrist_pitch']
+
 
 class DirectMotorsService:
     """Direct motor control bypassing lerobot library"""
@@ -22,35 +41,131 @@ class DirectMotorsService:
     INST_WRITE = 0x03
     INST_READ = 0x02
     INST_SYNC_WRITE = 0x83
+    BROADCAST_ID = 0xFE
+    ADDR_STATUS_RETURN_LEVEL = 8  # EEPROM: 0 = reply to READ/PING only, 1 = reply to everything
     ADDR_TORQUE_ENABLE = 40
+    ADDR_ACCELERATION = 41        # units of 100 ticks/s^2, 0 = unlimited
     ADDR_GOAL_POSITION = 42
+    ADDR_GOAL_SPEED = 46          # ticks/s, 0 = unlimited
+    ADDR_LOCK = 55                # EEPROM write lock
     ADDR_PRESENT_POSITION = 56
     
-    MOTOR_NAMES = ['base_yaw', 'base_pitch', 'elbow_pitch', 'wrist_roll', 'wrist_pitch']
+    MOTOR_NAMES = MOTOR_NAMES
+    MOTOR_IDS = [1, 2, 3, 4, 5]
+    
+    # Transition timing (seconds)
+    HOME_DURATION = 0.6     # min-jerk move back to home after an animation
+    BLEND_IN_DURATION = 0.25  # min-jerk move from current pose to an animation's first frame
+    CROSSFADE_DURATION = 0.3  # overlap between back-to-back animations
+    TRACKING_SETTLE = 0.1   # servos measured this long past an animation's last frame
+    
+    # Per-joint speed (deg/s) and acceleration (deg/s^2) limits, set in the servos
+    # and enforced on every outgoing frame; above what the recordings need
+    MOTION_LIMITS = {
+        'base_yaw': JointLimits(240.0, 2000.0),
+        'base_pitch': JointLimits(200.0, 1800.0),
+        'elbow_pitch': JointLimits(240.0, 2000.0),
+        'wrist_roll': JointLimits(300.0, 2200.0),
+        'wrist_pitch': JointLimits(240.0, 2200.0),
+    }
+    
+    # Bus arbitration: per joint, the claim of the highest priority source wins
+    SOURCE_PRIORITIES = {
+        "tracking": Priority.HIGH,
+        "animation": Priority.NORMAL,
+        "gesture": Priority.NORMAL,
+        "idle": Priority.LOW,
+    }
     
-    def __init__(self, port: str, fps: int = 30, baudrate: int = 1000000):
+    # How each source is layered on the home pose: overrides replace the pose of
+    # their joints, additive layers add their offset from home on top of it.
+    # A "gesture" is an animation played while tracking owns the pose.
+    LAYER_MODES = {
+        "tracking": OVERRIDE,
+        "animation": OVERRIDE,
+        "gesture": ADDITIVE,
+        "idle": ADDITIVE,
+    }
+    # Additive layers applied above every override; the others are covered by
+    # higher-priority overrides on the joints those hold (idle under animation)
+    ON_TOP_LAYERS = {"gesture"}
+    
+    def __init__(self, port: str, fps: int = 30, baudrate: int = 1000000, telemetry_rate: float = 10.0,
+                 status_return_level: Optional[int] = None, write_deadband: int = 1, keyframe_interval: float = 1.0,
+                 idle_rate: float = 10.0, idle_source: str = "procedural",
+                 motion_limits: Optional[Dict[str, JointLimits]] = None):
         self.port = port
         self.fps = fps
         self.baudrate = baudrate
+        # Status return level lives in EEPROM and the lerobot-based tools (replay,
+        # teleop, calibrate) expect a reply to every write, so it is left as the
+        # servos have it unless a level is given; that level is undone on stop
+        self.status_return_level = status_return_level
+        self._saved_return_levels: Dict[int, int] = {}
+        # Goal writes closer than write_deadband ticks to the last written goal are
+        # skipped; every keyframe_interval seconds a full frame is written regardless
+        self.write_deadband = write_deadband
+        self.keyframe_interval = keyframe_interval
+        self._last_keyframe = 0.0
+        self.motion_limits = {**self.MOTION_LIMITS, **(motion_limits or {})}
+        self.limiter = MotionLimiter({
+            motor_id: self.motion_limits[name]
+            for motor_id, name in zip(self.MOTOR_IDS, self.MOTOR_NAMES) if name in self.motion_limits
+        })
+        self.write_stats = {
+            "frames": 0, "packets_sent": 0, "packets_saved": 0,
+            "bytes_sent": 0, "bytes_saved": 0, "goals_suppressed": 0,
+        }
         self.ser = None
         self.running = False
         self._thread = None
-        self._idle_thread = None
         self._is_animating = False
-        self._event_queue = []
-        self._lock = threading.Lock()
+        self._queue = MotionQueue()
+        self._current_priority: Optional[Priority] = None  # priority of the running event
         self.recordings_dir = os.path.join(os.path.dirname(__file__), "..", "..", "recordings")
+        # Index of the recordings directory (polled for changes once started)
+        self.catalog = RecordingCatalog(self.recordings_dir, self.MOTOR_NAMES)
+        self.recording_cache = RecordingCache(self.recordings_dir, self.MOTOR_NAMES, fps=fps, catalog=self.catalog)
+        self.scheduler = PlaybackScheduler()
+        self.playback_stats: Dict[str, PlaybackStats] = {}  # last playback of each animation
+        self.tracking_stats: Dict[str, TrackingSummary] = {}  # commanded vs measured, last playback
+        self._tracking_recorder: Optional[TrackingRecorder] = None  # receives commanded frames
+        self._tracking_settling = None  # (recorder, deadline): still measuring after playback
+        self._tracking_lock = threading.Lock()
+        self._goal_pose: Dict[int, int] = {}  # last commanded goal per motor id
+        self._pending_tail = None  # tail frames of the previous animation, for crossfading
+        self._home_deferred = False  # skipped homing because another animation was queued
+        # Goal packets are patched in place instead of rebuilt on every write
+        self._frame_encoder = SyncWriteEncoder(len(self.MOTOR_IDS), self.ADDR_GOAL_POSITION)
+        self._position_encoder = PositionWriteEncoder(self.MOTOR_IDS, self.ADDR_GOAL_POSITION)
+        self._frame_packets: Optional[EncodedFrames] = None  # wire bytes of the frames being played
+        # Claims are blended as weighted layers over the home pose, one frame per tick
+        self.compositor = PoseCompositor(self.MOTOR_IDS)
+        for source, mode in self.LAYER_MODES.items():
+            self.compositor.configure(source, mode, on_top=source in self.ON_TOP_LAYERS)
+        # The bus writer also sends a keyframe on its own while no source is claiming
+        self.bus = BusOwner(self.write_goal_frame, compositor=self.compositor,
+                            keyframe=self._write_keyframe, keyframe_interval=keyframe_interval)
+        # Parses every status reply on the bus into per-motor health
+        self.status_reader = StatusReader(self)
+        # Position/speed/load/voltage/temperature via SYNC_READ (0 disables)
+        self.telemetry = TelemetryReader(self, rate=telemetry_rate)
+        # Idle motion from a precomputed loop ("procedural" or a recording name, 0 Hz disables)
+        self.idle = IdleEngine(self, rate=idle_rate, source=idle_source)
         
         # Position offsets: current_position = offset + animation_value
         # Loaded from motor_offsets.json or default to 2048 (center)
+        self.offsets_file = os.path.join(os.path.dirname(__file__), "..", "..", "..", "motor_offsets.json")
+        self._offsets_mtime = None
         self.offsets = {name: 2048 for name in self.MOTOR_NAMES}
         self._load_offsets()
     
     def _load_offsets(self):
         """Load position offsets from file"""
-        offsets_file = os.path.join(os.path.dirname(__file__), "..", "..", "..", "motor_offsets.json")
+        offsets_file = self.offsets_file
         if os.path.exists(offsets_file):
             try:
+                self._offsets_mtime = os.path.getmtime(offsets_file)
                 with open(offsets_file, 'r') as f:
                     loaded = json.load(f)
                 for name in self.MOTOR_NAMES:
@@ -59,24 +174,62 @@ class DirectMotorsService:
                 logger.info(f"Loaded motor offsets from {offsets_file}")
             except Exception as e:
                 logger.warning(f"Could not load offsets: {e}")
+        self.compositor.set_base(self._home_pose())
+    
+    def _reload_offsets_if_changed(self):
+        """Reload offsets when motor_offsets.json was modified since last load"""
+        try:
+            mtime = os.path.getmtime(self.offsets_file)
+        except OSError:
+            return
+        if mtime != self._offsets_mtime:
+            self._load_offsets()
     
     def start(self):
         """Start the motor service"""
         try:
-            self.ser = serial.Serial(self.port, self.baudrate, timeout=0.5)
+            # Parse and compile all recordings up front so playback never touches disk
+            self.catalog.refresh()
+            self.catalog.watch()
+            self.recording_cache.load_all(self.offsets)
+            
+            # serial_for_url also accepts sts3215:// ports served by the bus emulator
+            if self.port.startswith("sts3215://") and "lelamp.service.motors" not in serial.protocol_handler_packages:
+                serial.protocol_handler_packages.append("lelamp.service.motors")
+            self.ser = serial.serial_for_url(self.port, self.baudrate, timeout=0.5)
             time.sleep(0.3)
+            self.ser.reset_input_buffer()
+            self.status_reader.start()
+            
+            # At level 0 write-only traffic (goals, torque) produces no replies
+            if self.status_return_level is not None:
+                for motor_id in self.MOTOR_IDS:
+                    previous = self._configure_status_return_level(motor_id, self.status_return_level)
+                    if previous is not None and previous != self.status_return_level:
+                        self._saved_return_levels[motor_id] = previous
+            
+            # Let the servo firmware ramp between goals within the joint limits
+            for motor_id, name in zip(self.MOTOR_IDS, self.MOTOR_NAMES):
+                self._configure_motion_limits(motor_id, self.motion_limits.get(name))
             
             # Enable torque on all motors
             for motor_id in range(1, 6):
                 self._set_torque(motor_id, True)
             
+            # The first moves are limited from where the joints really are
+            self.limiter.seed(self._measured_positions(attempts=3), time.monotonic())
+            
+            # Single writer thread owns the bus from here on
+            self.bus.start()
+            self.telemetry.start()
+            
             self.running = True
+            self._queue = MotionQueue()
             self._thread = threading.Thread(target=self._process_queue, daemon=True)
             self._thread.start()
             
-            # Start idle breathing animation thread
-            self._idle_thread = threading.Thread(target=self._idle_loop, daemon=True)
-            self._idle_thread.start()
+            # Start idle breathing animation
+            self.idle.start()
             print("🌬️ Idle breathing animation started")
             
             logger.info(f"DirectMotorsService connected to {self.port}")
@@ -85,71 +238,231 @@ class DirectMotorsService:
             logger.error(f"Failed to start motors: {e}")
             raise
     
-    def _idle_loop(self):
-        """Subtle idle movements to keep lamp feeling alive"""
-        import math
-        phase = 0
-        while self.running:
-            if not self._is_animating:
-                # Gentle breathing/looking motion
-                # Wrist pitch: up/down nod (+/- 10 degrees)
-                nod = math.sin(phase) * 10
-                offset = self.offsets.get('wrist_pitch', 2048)
-                pos = int(offset + (nod / 180.0) * 2048)
-                self._set_position(5, max(0, min(4095, pos)))
-                
-                # Base yaw: slow side-to-side sway (+/- 5 degrees)
-                sway = math.sin(phase * 0.3) * 5
-                offset = self.offsets.get('base_yaw', 2048)
-                pos = int(offset + (sway / 180.0) * 2048)
-                self._set_position(1, max(0, min(4095, pos)))
-                
-                phase += 0.15
-            time.sleep(0.05)  # 20 FPS for smoother idle
-    
     def stop(self):
         """Stop the motor service"""
         self.running = False
+        self.catalog.stop()
+        self.idle.stop()
+        self._queue.close()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=1.0)
+        self._close_tracking_metrics()
+        self.telemetry.stop()
+        self.bus.stop()
         if self.ser:
             # Disable torque
             for motor_id in range(1, 6):
                 self._set_torque(motor_id, False)
+            for motor_id, level in self._saved_return_levels.items():
+                self._configure_status_return_level(motor_id, level)
+            self._saved_return_levels.clear()
+            self.status_reader.stop()
             self.ser.close()
             self.ser = None
     
-    def dispatch(self, event_type: str, payload: Any):
-        """Queue an event for processing"""
-        with self._lock:
-            self._event_queue.append((event_type, payload))
+    def dispatch(self, event_type: str, payload: Any, priority: Priority = Priority.NORMAL):
+        """Queue an event for processing
+        
+        "play" takes a recording name, or a dict such as
+        {"name": "nod", "rate": 1.5} or {"name": "nod", "duration": 0.6}
+        to speed up, slow down or fit the animation to a target length. The
+        duration includes the blend-in from the current pose.
+        
+        A newer "play"/"home" replaces a pending one of the same priority, and a
+        higher priority event preempts the running animation at the next frame.
+        Raises ValueError for a play with a rate or duration that is not positive.
+        """
+        if event_type == "play" and isinstance(payload, dict):
+            rate = payload.get("rate", 1.0)
+            if rate is None or not rate > 0:
+                raise ValueError(f"Playback rate must be positive, got {rate}")
+            duration = payload.get("duration")
+            if duration is not None and not duration > 0:
+                raise ValueError(f"Playback duration must be positive, got {duration}")
+        self.idle.touch()
+        self._queue.put(event_type, payload, priority)
     
     def _process_queue(self):
         """Process events from queue"""
         while self.running:
-            event = None
-            with self._lock:
-                if self._event_queue:
-                    event = self._event_queue.pop(0)
+            event = self._queue.get(timeout=0.5)
+            if event is None:
+                if self._pending_tail is not None or self._home_deferred:
+                    # The animation we left a tail for (or skipped homing for) was dropped as stale
+                    self._pending_tail = None
+                    self._home_deferred = False
+                    self._handle_home()
+                continue
             
-            if event:
-                event_type, payload = event
-                if event_type == "play":
-                    self._handle_play(payload)
-                elif event_type == "home":
+            self._home_deferred = False
+            self._current_priority = event.priority
+            try:
+                if event.event_type == "play":
+                    payload = event.payload
+                    if isinstance(payload, dict):
+                        self._handle_play(payload["name"], payload.get("rate", 1.0), payload.get("duration"))
+                    else:
+                        self._handle_play(payload)
+                elif event.event_type == "home":
+                    self._pending_tail = None
                     self._handle_home()
-            else:
-                time.sleep(0.01)
+            except Exception as e:
+                # A bad request must not take the motion thread down with it
+                logger.error(f"Error handling {event.event_type} event: {e}")
+            finally:
+                self._current_priority = None
+    
+    def _should_preempt(self) -> bool:
+        """Stop the running motion at the next frame boundary?"""
+        if not self.running:
+            return True
+        return self._current_priority is not None and self._queue.should_preempt(self._current_priority)
+    
+    def _play_queued(self) -> bool:
+        """True if the next queued event is another animation"""
+        event = self._queue.peek()
+        return event is not None and event.event_type == "play"
+    
+    def claim_joints(self, source: str, goals: Dict[int, int], priority: Optional[Priority] = None):
+        """Submit goal positions {motor_id: position} for a motion source.
+        
+        The bus writer merges all sources per joint by priority and writes one
+        sync-write frame per tick. priority defaults to SOURCE_PRIORITIES[source].
+        """
+        if priority is None:
+            priority = self.SOURCE_PRIORITIES.get(source, Priority.NORMAL)
+        if source != "idle":
+            self.idle.touch()
+        self.bus.claim(source, goals, priority)
+    
+    def release_joints(self, source: str):
+        """Stop driving the joints claimed by source (servos hold their last goal)"""
+        self.bus.release(source)
+    
+    def set_layer(self, source: str, weight: float = 1.0, mask: Optional[Dict[str, float]] = None):
+        """Blend weight of a source's layer (0-1), optionally per joint name
+        
+        e.g. set_layer("tracking", 0.5, {"base_yaw": 1.0}) lets tracking steer
+        the yaw fully while only half-overriding the other joints.
+        """
+        ids = dict(zip(self.MOTOR_NAMES, self.MOTOR_IDS))
+        joint_mask = {ids[name]: value for name, value in mask.items()} if mask else None
+        self.compositor.configure(source, self.LAYER_MODES.get(source, OVERRIDE), weight, joint_mask,
+                                  on_top=source in self.ON_TOP_LAYERS)
+    
+    def _home_pose(self) -> np.ndarray:
+        return np.array([self.offsets.get(name, 2048) for name in self.MOTOR_NAMES], dtype=np.int32)
+    
+    def _measured_positions(self, attempts: int = 1) -> Dict[int, int]:
+        """Present position per motor id from the latest telemetry; read up to
+        attempts times while that is missing joints (e.g. before the poller ran)"""
+        snapshot = self.telemetry.latest()
+        for _ in range(attempts):
+            if self.ser is None or (snapshot is not None and len(snapshot.joints) == len(self.MOTOR_IDS)):
+                break
+            snapshot = self.telemetry.read_now() or snapshot
+        if snapshot is None:
+            return {}
+        ids = dict(zip(self.MOTOR_NAMES, self.MOTOR_IDS))
+        return {ids[name]: joint.position for name, joint in snapshot.joints.items() if name in ids}
+    
+    def _current_pose(self) -> np.ndarray:
+        """Last commanded pose for all motors; motors never commanded are where
+        telemetry measured them (home if they could not be read either)"""
+        home = self._home_pose()
+        # Claims not yet flushed by the bus writer are newer than what was written
+        pose = {**self._goal_pose, **self.bus.merged_frame()}
+        if len(pose) < len(self.MOTOR_IDS):
+            pose = {**self._measured_positions(), **pose}
+        return np.array([pose.get(i, home[i - 1]) for i in self.MOTOR_IDS], dtype=np.int32)
+    
+    def _emit_pose(self, pose: np.ndarray):
+        goals = np.rint(pose).astype(np.int32)  # interpolated frames are float
+        recorder = self._tracking_recorder
+        if recorder is not None:
+            recorder.command(time.monotonic(), goals.tolist())
+        
+        # Hand the pre-encoded packet along when the frame is the one we encoded
+        packet = None
+        encoded = self._frame_packets
+        index = self.scheduler.frame_index
+        if encoded is not None and 0 <= index < encoded.frame_count and np.array_equal(encoded.positions[index], goals):
+            packet = encoded.packet(index)
+        self.bus.claim("animation", dict(zip(self.MOTOR_IDS, goals.tolist())),
+                       self.SOURCE_PRIORITIES["animation"], packet=packet)
+    
+    def _run_frames(self, name: str, times: np.ndarray, frames: np.ndarray) -> PlaybackStats:
+        """Play full-pose frames through the scheduler, pre-encoded to wire bytes"""
+        self._frame_packets = encode_goal_frames(self.MOTOR_IDS, frames, self.ADDR_GOAL_POSITION)
+        try:
+            return self.scheduler.run(name, times, frames, self._emit_pose, should_stop=self._should_preempt)
+        finally:
+            self._frame_packets = None
+    
+    def _begin_tracking_metrics(self, name: str):
+        """Record commanded vs measured positions for this playback (needs telemetry)"""
+        if not self.telemetry.running:
+            return
+        self._close_tracking_metrics()  # the previous playback may still be settling
+        recorder = TrackingRecorder(name, self.MOTOR_IDS, self.MOTOR_NAMES)
+        
+        def on_sample(snap):
+            recorder.measure(snap.monotonic, {n: j.position for n, j in snap.joints.items()})
+            settling = self._tracking_settling
+            if settling is not None and settling[0] is recorder and snap.monotonic >= settling[1]:
+                self._close_tracking_metrics(recorder)
+        
+        self._on_tracking_sample = on_sample
+        self._tracking_rate = self.telemetry.rate
+        self.telemetry.rate = max(self.telemetry.rate, self.fps)  # sample at frame rate while playing
+        self.telemetry.subscribe(self._on_tracking_sample)
+        self._tracking_recorder = recorder
+    
+    def _end_tracking_metrics(self, settle: float = 0.0):
+        """Stop recording commands; the telemetry thread keeps measuring for settle
+        seconds and then closes the measurement, so playback never waits for it"""
+        recorder = self._tracking_recorder
+        if recorder is None:
+            return
+        self._tracking_recorder = None
+        self._tracking_settling = (recorder, time.monotonic() + settle)
+        if settle <= 0:
+            self._close_tracking_metrics(recorder)
+    
+    def _close_tracking_metrics(self, recorder: Optional[TrackingRecorder] = None):
+        """Summarize the settling measurement (only if it is recorder's, when given)"""
+        with self._tracking_lock:
+            settling = self._tracking_settling
+            if settling is None or (recorder is not None and settling[0] is not recorder):
+                return
+            recorder = settling[0]
+            self._tracking_settling = None
+            self.telemetry.unsubscribe(self._on_tracking_sample)
+            self.telemetry.rate = self._tracking_rate
+        summary = recorder.summarize()
+        self.tracking_stats[recorder.name] = summary
+        worst = max(summary.joints.items(), key=lambda kv: kv[1].rms_error_deg, default=None)
+        if worst:
+            logger.info(
+                f"Tracking {recorder.name}: {summary.measured_samples} samples, worst joint {worst[0]} "
+                f"rms {worst[1].rms_error_deg:.1f}° max {worst[1].max_error_deg:.1f}° "
+                f"latency {worst[1].latency_ms:.0f}ms"
+            )
     
     def _handle_home(self):
-        """Return lamp to home/zero position (offsets)"""
+        """Return lamp to home/zero position (offsets) along a min-jerk trajectory"""
         logger.info("Going to home position...")
         
-        # Smooth transition to home over 30 frames
-        steps = 30
-        for step in range(steps + 1):
-            for i, name in enumerate(self.MOTOR_NAMES, 1):
-                offset = self.offsets.get(name, 2048)
-                self._set_position(i, offset)
-            time.sleep(1/30)
+        home = self._home_pose()
+        start = self._current_pose()
+        known = self._goal_pose or self.bus.merged_frame() or self._measured_positions()
+        if not known or np.abs(home - start).max() <= 1:
+            # Unknown start pose or already there: a single frame is enough
+            self._emit_pose(home)
+        else:
+            times, frames = blend_poses(start, home, self.HOME_DURATION, self.fps)
+            self._run_frames("home", times, frames)
+        self.release_joints("animation")
         
         logger.info("Home position reached")
     
@@ -160,24 +473,123 @@ class DirectMotorsService:
         checksum = (~(motor_id + length + instruction + sum(params))) & 0xFF
         return packet + bytes([checksum])
     
+    def _read_register(self, motor_id: int, address: int, length: int, timeout: float = 0.05) -> Optional[bytes]:
+        """Read bytes from a servo register. Returns None if the servo didn't answer."""
+        packet = self._build_packet(motor_id, self.INST_READ, bytes([address, length]))
+        with self.bus.lock:
+            self.status_reader.expect([motor_id])
+            self.ser.write(packet)
+            replies = self.status_reader.wait(timeout)
+        if motor_id not in replies:
+            return None
+        return replies[motor_id][1]
+    
+    def _write_register(self, motor_id: int, address: int, data: bytes):
+        """Write bytes to a servo register (any reply is handled by the status reader)"""
+        packet = self._build_packet(motor_id, self.INST_WRITE, bytes([address]) + bytes(data))
+        with self.bus.lock:
+            self.ser.write(packet)
+    
+    def _configure_status_return_level(self, motor_id: int, level: int) -> Optional[int]:
+        """Set the servo's status return level, touching EEPROM only if it differs.
+        Returns the previous level, or None if the servo didn't answer."""
+        current = self._read_register(motor_id, self.ADDR_STATUS_RETURN_LEVEL, 1)
+        if current is None:
+            logger.warning(f"Motor {motor_id} did not answer status return level read")
+            return None
+        if current[0] == level:
+            return level
+        self._write_register(motor_id, self.ADDR_LOCK, bytes([0]))
+        self._write_register(motor_id, self.ADDR_STATUS_RETURN_LEVEL, bytes([level]))
+        self._write_register(motor_id, self.ADDR_LOCK, bytes([1]))
+        logger.info(f"Motor {motor_id} status return level {current[0]} -> {level}")
+        return current[0]
+    
+    def _configure_motion_limits(self, motor_id: int, limits: Optional[JointLimits]):
+        """Write goal speed and acceleration registers (RAM, so on every start)"""
+        if limits is None:
+            return
+        speed = limits.speed_register
+        self._write_register(motor_id, self.ADDR_ACCELERATION, bytes([limits.acceleration_register]))
+        self._write_register(motor_id, self.ADDR_GOAL_SPEED, bytes([speed & 0xFF, (speed >> 8) & 0xFF]))
+    
     def _set_torque(self, motor_id: int, enable: bool):
         """Enable/disable motor torque"""
-        packet = self._build_packet(motor_id, self.INST_WRITE, 
-                                    bytes([self.ADDR_TORQUE_ENABLE, 1 if enable else 0]))
-        self.ser.write(packet)
-        time.sleep(0.002)
-        self.ser.read(20)
+        self._write_register(motor_id, self.ADDR_TORQUE_ENABLE, bytes([1 if enable else 0]))
     
     def _set_position(self, motor_id: int, position: int):
         """Set goal position (0-4095, center is ~2048) - non-blocking"""
         pos = max(0, min(4095, int(position)))
-        pos_low = pos & 0xFF
-        pos_high = (pos >> 8) & 0xFF
-        packet = self._build_packet(motor_id, self.INST_WRITE, 
-                                    bytes([self.ADDR_GOAL_POSITION, pos_low, pos_high]))
-        self.ser.write(packet)
+        self._goal_pose[motor_id] = pos
+        with self.bus.lock:
+            self.ser.write(self._position_encoder.encode(motor_id, pos))
         # Don't wait for response - just send and continue for speed
     
+    def write_goal_frame(self, goals: Dict[int, int], packet: Optional[memoryview] = None) -> bool:
+        """Set goal positions for several motors in a single SYNC_WRITE packet.
+        
+        goals maps motor_id -> position (0-4095). Sync writes are broadcast,
+        so the servos send no status reply and the whole frame costs one
+        packet on the bus instead of one per motor.
+        
+        Goals within write_deadband ticks of the last written goal are dropped,
+        except on a keyframe: the first frame once keyframe_interval seconds
+        have passed since the last one is written in full. When no frame is
+        written at all for that long, the bus writer calls _write_keyframe.
+        
+        Goals are first passed through the per-joint speed/acceleration limiter.
+        Returns False while a limited joint has not reached its goal yet, so
+        the bus writer keeps writing frames until it has.
+        
+        packet may hold the pre-encoded SYNC_WRITE for exactly these goals; it
+        is sent as-is when neither the limiter nor the deadband changed them.
+        
+        This writes immediately; motion sources should go through
+        claim_joints() so the bus writer can arbitrate between them.
+        """
+        if not goals:
+            return True
+        stats = self.write_stats
+        stats["frames"] += 1
+        now = time.monotonic()
+        keyframe = now - self._last_keyframe >= self.keyframe_interval
+        
+        goals, reached = self.limiter.limit(goals, now)
+        if not reached:
+            packet = None
+        
+        changed = {}
+        for motor_id, position in goals.items():
+            pos = max(0, min(4095, int(position)))
+            last = self._goal_pose.get(motor_id)
+            if not keyframe and last is not None and abs(pos - last) < self.write_deadband:
+                stats["goals_suppressed"] += 1
+                continue
+            self._goal_pose[motor_id] = pos
+            changed[motor_id] = pos
+        
+        skipped = len(goals) - len(changed)
+        if not changed:
+            stats["packets_saved"] += 1
+            stats["bytes_saved"] += 8 + 3 * skipped
+            return reached
+        stats["bytes_saved"] += 3 * skipped
+        
+        with self.bus.lock:
+            if packet is None or skipped:
+                packet = self._frame_encoder.encode(changed)
+            self.ser.write(packet)
+        stats["packets_sent"] += 1
+        stats["bytes_sent"] += len(packet)
+        if keyframe:
+            self._last_keyframe = now
+        return reached
+    
+    def _write_keyframe(self):
+        """Rewrite every goal the servos were last sent (bus writer, when idle)"""
+        if self.ser is not None and self._goal_pose:
+            self.write_goal_frame(dict(self._goal_pose))
+    
     def _degrees_to_position(self, degrees: float, motor_name: str = None) -> int:
         """Convert animation degrees to position, applying offset for current zero point"""
         # Animation value is relative: 0° in animation = offset position
@@ -188,75 +600,180 @@ class DirectMotorsService:
         position = int(offset + (degrees / 180.0) * 2048)
         return max(0, min(4095, position))
     
-    def _handle_play(self, recording_name: str):
-        """Play a recording by name - uses relative movement from first frame"""
-        csv_filename = f"{recording_name}.csv"
-        csv_path = os.path.join(self.recordings_dir, csv_filename)
+    def _handle_play(self, recording_name: str, rate: float = 1.0, duration: Optional[float] = None):
+        """Play a recording by name - uses relative movement from first frame
+        
+        rate scales playback speed; duration (seconds) overrides rate and
+        resamples the recording so that it, blend-in included, lasts that long.
+        """
+        self._reload_offsets_if_changed()
+        recording = self.recording_cache.get(recording_name, self.offsets)
         
-        if not os.path.exists(csv_path):
-            logger.error(f"Recording not found: {csv_path}")
+        if recording is None or recording.frame_count == 0:
+            if recording is None:
+                logger.error(f"Recording not found: {recording_name}")
+            else:
+                logger.error(f"No actions in recording: {recording_name}")
+            if self._pending_tail is not None:
+                # The previous animation stopped short expecting us; finish at home instead
+                self._pending_tail = None
+                self._handle_home()
+            return
+        
+        if self.bus.has_claim("tracking"):
+            # Tracking owns the pose: play the recorded joints as a gesture on top of it
+            self._pending_tail = None
+            self._play_gesture(recording_name, recording, rate, duration)
             return
         
         self._is_animating = True  # Pause idle animation
         try:
-            with open(csv_path, 'r') as csvfile:
-                csv_reader = csv.DictReader(csvfile)
-                actions = list(csv_reader)
+            # Ticks are precompiled: offset + (frame - first_frame), clamped to 0-4095
+            # Joints missing from the recording hold their current pose
+            current = self._current_pose()
+            ticks = np.tile(current, (recording.frame_count, 1))
+            ticks[:, recording.motor_ids - 1] = recording.ticks
+            # Honour recorded timestamps; recordings without them play at self.fps
+            times = frame_times(recording.timestamps, recording.frame_count, self.fps)
             
-            if not actions:
-                logger.error(f"No actions in recording: {recording_name}")
-                self._is_animating = False
-                return
+            tail, self._pending_tail = self._pending_tail, None
+            # Blend from wherever we are to the first frame instead of snapping (a
+            # tail handed over by the previous animation is crossfaded instead)
+            blend_in = 0.0
+            if tail is None and np.abs(ticks[0] - current).max() > 1:
+                blend_in = self.BLEND_IN_DURATION
+                if duration is not None:
+                    # The blend-in counts toward the requested length
+                    blend_in = min(blend_in, duration / 2)
+                    duration -= blend_in
+            if (rate != 1.0 or duration is not None) and recording.curves is not None:
+                # Keyframe recordings are evaluated exactly at the warped times
+                times, source_times = warp_times(recording.curves.duration, self.fps, rate, duration)
+                ticks = np.tile(current, (len(times), 1))
+                ticks[:, recording.motor_ids - 1] = recording.ticks_at(source_times)
+            elif rate != 1.0 or duration is not None:
+                times, ticks = time_warp(times, ticks, self.fps, rate=rate, duration=duration)
             
-            # Get first frame values as base reference
-            first_frame = actions[0]
-            base_degrees = {}
-            for name in self.MOTOR_NAMES:
-                key = f"{name}.pos"
-                if key in first_frame:
-                    base_degrees[name] = float(first_frame[key])
+            if tail is not None:
+                # Previous animation handed over its tail: crossfade into our head
+                ticks = crossfade(tail, ticks)
+            elif blend_in > 0:
+                lead_times, lead = blend_poses(current, ticks[0], blend_in, self.fps)
+                times = np.concatenate([lead_times[:-1], lead_times[-1] + times - times[0]])
+                ticks = np.concatenate([lead[:-1], ticks])
             
-            logger.info(f"Playing {len(actions)} frames from {recording_name}")
+            if self._play_queued():
+                # Another animation is waiting: leave our tail for it to crossfade with
+                overlap = min(int(round(self.CROSSFADE_DURATION * self.fps)), len(ticks) // 2)
+                if overlap > 0:
+                    self._pending_tail = ticks[-overlap:]
+                    times, ticks = times[:-overlap], ticks[:-overlap]
             
-            for row in actions:
-                t0 = time.perf_counter()
-                
-                # Apply relative movement: current_offset + (frame_value - first_frame_value)
-                for i, name in enumerate(self.MOTOR_NAMES, 1):
-                    key = f"{name}.pos"
-                    if key in row and name in base_degrees:
-                        current_degrees = float(row[key])
-                        delta_degrees = current_degrees - base_degrees[name]
-                        # Convert delta to position units and add to offset
-                        offset = self.offsets.get(name, 2048)
-                        position = int(offset + (delta_degrees / 180.0) * 2048)
-                        position = max(0, min(4095, position))
-                        self._set_position(i, position)
-                
-                # Maintain FPS timing
-                elapsed = time.perf_counter() - t0
-                sleep_time = 1.0 / self.fps - elapsed
-                if sleep_time > 0:
-                    time.sleep(sleep_time)
+            logger.info(f"Playing {len(ticks)} frames from {recording_name}")
             
+            self._begin_tracking_metrics(recording_name)
+            stats = None
+            try:
+                stats = self._run_frames(recording_name, times, ticks)
+            finally:
+                # Measure the servos settling on the last frame while we move on
+                settled = stats is not None and not stats.preempted
+                self._end_tracking_metrics(self.TRACKING_SETTLE if settled else 0.0)
+            self.playback_stats[recording_name] = stats
+            if stats.preempted:
+                # Whatever preempted us takes over from the current pose
+                self._pending_tail = None
+                logger.info(f"Preempted {recording_name} after {stats.frames_sent} frames")
+                return
+            
+            logger.info(
+                f"Playback timing {recording_name}: {stats.frames_sent}/{stats.frames_total} frames, "
+                f"{stats.frames_skipped} skipped, {stats.overruns} overruns, "
+                f"jitter mean {stats.jitter_mean_ms:.1f}ms p95 {stats.jitter_p95_ms:.1f}ms, "
+                f"{stats.actual_s:.2f}s (planned {stats.planned_s:.2f}s)"
+            )
             logger.info(f"Finished playing: {recording_name}")
             
-            # Return to home/0th position after animation
-            self._handle_home()
+            # Return to home/0th position after animation, unless another one follows
+            if self._pending_tail is None and not self._play_queued():
+                self._handle_home()
+            elif self._pending_tail is None:
+                # Home once the queued animation turns out to be dropped
+                self._home_deferred = True
             
         except Exception as e:
             logger.error(f"Error playing {recording_name}: {e}")
         finally:
+            self.release_joints("animation")
             self._is_animating = False  # Resume idle animation
     
-    def get_available_recordings(self) -> List[str]:
-        """Get list of available recording names"""
-        if not os.path.exists(self.recordings_dir):
-            return []
+    def _play_gesture(self, recording_name: str, recording, rate: float = 1.0, duration: Optional[float] = None):
+        """Play a recording as an additive layer: its offset from the first frame
+        is added to whatever drives the recorded joints, then eased back to zero"""
+        columns = recording.motor_ids - 1
+        ids = [self.MOTOR_IDS[c] for c in columns]
+        home = self._home_pose()[columns]
         
-        recordings = []
-        for filename in os.listdir(self.recordings_dir):
-            if filename.endswith(".csv"):
-                recordings.append(filename[:-4])
+        def emit(pose: np.ndarray):
+            goals = np.rint(pose).astype(np.int32).tolist()
+            self.bus.claim("gesture", dict(zip(ids, goals)), self.SOURCE_PRIORITIES["gesture"])
         
-        return sorted(recordings)
+        try:
+            # Recorded ticks are home + offset from the first frame, so a gesture starts at zero offset
+            times = frame_times(recording.timestamps, recording.frame_count, self.fps)
+            ticks = recording.ticks
+            if (rate != 1.0 or duration is not None) and recording.curves is not None:
+                times, source_times = warp_times(recording.curves.duration, self.fps, rate, duration)
+                ticks = recording.ticks_at(source_times)
+            elif rate != 1.0 or duration is not None:
+                times, ticks = time_warp(times, ticks, self.fps, rate=rate, duration=duration)
+            if np.abs(ticks[-1] - home).max() > 1:
+                tail_times, tail = blend_poses(ticks[-1], home, self.HOME_DURATION, self.fps)
+                times = np.concatenate([times, times[-1] + tail_times])
+                ticks = np.concatenate([ticks, tail])
+            
+            logger.info(f"Playing {len(ticks)} frames from {recording_name} as a gesture")
+            stats = self.scheduler.run(recording_name, times, ticks, emit, should_stop=self._should_preempt)
+            self.playback_stats[recording_name] = stats
+            logger.info(f"Finished gesture {recording_name}: {stats.frames_sent}/{stats.frames_total} frames")
+        except Exception as e:
+            logger.error(f"Error playing {recording_name}: {e}")
+        finally:
+            self.release_joints("gesture")
+    
+    def get_bus_stats(self) -> dict:
+        """Goal write counters, including packets/bytes saved by the deadband"""
+        return {
+            **self.write_stats,
+            "bus_frames_written": self.bus.frames_written,
+            "bus_keyframes_written": self.bus.keyframes_written,
+            "frames_limited": self.limiter.frames_limited,
+            "telemetry_reads": self.telemetry.reads,
+            "idle": self.idle.get_stats(),
+        }
+    
+    def get_motor_health(self) -> Dict[str, dict]:
+        """Error flags and reply counters per joint, from parsed status replies"""
+        health = self.status_reader.get_health()
+        return {name: health[i].as_dict() for i, name in zip(self.MOTOR_IDS, self.MOTOR_NAMES) if i in health}
+    
+    def get_telemetry(self) -> Optional[dict]:
+        """Latest position/speed/load/voltage/temperature of every joint, or None"""
+        snapshot = self.telemetry.latest()
+        return snapshot.as_dict() if snapshot else None
+    
+    def get_playback_stats(self) -> Dict[str, dict]:
+        """Timing statistics of the last playback of each animation"""
+        return {name: stats.as_dict() for name, stats in self.playback_stats.items()}
+    
+    def get_tracking_stats(self) -> Dict[str, dict]:
+        """Per-joint commanded-vs-measured error of the last playback of each animation"""
+        return {name: summary.as_dict() for name, summary in self.tracking_stats.items()}
+    
+    def get_available_recordings(self) -> List[str]:
+        """Get list of available recording names (CSV, binary animation or keyframes)"""
+        return self.catalog.list_names()
+    
+    def get_recording_catalog(self) -> List[dict]:
+        """Frames, duration, joint ranges, checksum and mtime of every recording"""
+        return [info.as_dict() for info in self.catalog.entries()]
@@ -0,0 +1,229 @@
+"""
+Procedural idle motion for DirectMotorsService
+
+The idle pose is a precomputed, seamlessly looping table of joint offsets
+from home: layered sines plus smoothed noise per joint, or a recording
+(e.g. idle.csv) resampled to the idle rate. Each tick is a table lookup,
+and a frame is only claimed when it differs from the previous one.
+
+After a period without any other motion the engine drops to a low-power
+rate, or eases back to home and stops writing altogether ("hold": the
+servos keep torque on their last goal). The idle amplitude ramps in and
+out, so resuming after an animation or waking from low power never jumps.
+"""
+import time
+import threading
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .playback import frame_times, sample_frames
+
+logger = logging.getLogger(__name__)
+
+TICKS_PER_DEGREE = 2048 / 180.0
+
+
+@dataclass
+class IdleLayer:
+    amplitude: float        # degrees
+    period: float           # seconds (rounded so it loops with the table)
+    phase: float = 0.0      # radians
+
+
+@dataclass
+class IdleJoint:
+    layers: List[IdleLayer] = field(default_factory=list)
+    noise: float = 0.0          # peak degrees of smoothed noise
+    noise_period: float = 3.0   # shortest noise period in seconds
+
+
+# Gentle breathing/looking motion: wrist pitch nods, base yaw sways
+DEFAULT_IDLE_PROFILE: Dict[str, IdleJoint] = {
+    "wrist_pitch": IdleJoint([IdleLayer(10.0, 2.1)], noise=1.5),
+    "base_yaw": IdleJoint([IdleLayer(5.0, 7.0)], noise=1.5, noise_period=5.0),
+}
+
+
+def waveform_table(profile: Dict[str, IdleJoint], joint_names: List[str], rate: float,
+                   loop_s: float, seed: int = 0) -> np.ndarray:
+    """Degrees offset per joint (samples x joints) over one loop of loop_s seconds.
+
+    Sine periods are rounded to a whole number of cycles per loop and the noise
+    is low-passed circularly, so the last sample flows into the first.
+    """
+    n = max(int(round(loop_s * rate)), 2)
+    t = np.arange(n) / rate
+    loop_s = n / rate
+    rng = np.random.default_rng(seed)
+    table = np.zeros((n, len(joint_names)), dtype=np.float64)
+    for j, name in enumerate(joint_names):
+        joint = profile.get(name)
+        if joint is None:
+            continue
+        for layer in joint.layers:
+            cycles = max(1, int(round(loop_s / layer.period)))
+            table[:, j] += layer.amplitude * np.sin(2 * np.pi * cycles * t / loop_s + layer.phase)
+        if joint.noise > 0:
+            spectrum = np.fft.rfft(rng.standard_normal(n))
+            spectrum[np.fft.rfftfreq(n, 1.0 / rate) > 1.0 / joint.noise_period] = 0
+            spectrum[0] = 0
+            noise = np.fft.irfft(spectrum, n)
+            peak = np.abs(noise).max()
+            if peak > 0:
+                table[:, j] += noise / peak * joint.noise
+    return table
+
+
+def recording_table(times: np.ndarray, degrees: np.ndarray, rate: float,
+                    blend_s: float = 1.0) -> np.ndarray:
+    """Degrees offset from the first frame, resampled to rate and made to loop.
+
+    The last blend_s seconds are crossfaded into the first ones so the loop
+    point is continuous.
+    """
+    query = np.arange(0.0, times[-1], 1.0 / rate) if times[-1] > 0 else np.zeros(1)
+    table = sample_frames(times, degrees - degrees[0], query)
+    blend = min(int(round(blend_s * rate)), len(table) // 4)
+    if blend > 0:
+        # Shorten by `blend` samples: the tail fades into the head it wraps around to
+        head, tail = table[:blend].copy(), table[-blend:]
+        w = (np.arange(1, blend + 1) / (blend + 1))[:, None]
+        table = table[:-blend].copy()
+        table[:blend] = tail * (1 - w) + head * w
+    return table
+
+
+class IdleEngine:
+    """Background idle-motion source claiming joints as "idle" on the motor bus"""
+
+    def __init__(self, motor_service, rate: float = 10.0, source: str = "procedural",
+                 profile: Optional[Dict[str, IdleJoint]] = None, loop_s: float = 42.0,
+                 inactivity_timeout: float = 120.0, low_power: str = "rate",
+                 low_power_rate: float = 2.0, ramp_s: float = 1.0):
+        self.motor_service = motor_service
+        self.rate = rate
+        self.source = source                      # "procedural" or a recording name
+        self.profile = profile or DEFAULT_IDLE_PROFILE
+        self.loop_s = loop_s
+        self.inactivity_timeout = inactivity_timeout  # seconds, 0 disables low power
+        self.low_power = low_power                # "rate" or "hold"
+        self.low_power_rate = low_power_rate
+        self.ramp_s = ramp_s
+
+        self.running = False
+        self.thread = None
+        self.mode = "stopped"                     # active, low_power, hold, paused
+        self.frames_claimed = 0
+        self.frames_unchanged = 0
+
+        self._wake = threading.Event()
+        self._last_activity = time.monotonic()
+        self._motor_ids = np.zeros(0, dtype=np.int64)
+        self._table = np.zeros((1, 0))            # tick offsets from home (samples x claimed joints)
+        self._table_rate = rate
+
+    def start(self):
+        if self.running or self.rate <= 0:
+            return
+        self.build()
+        self.running = True
+        self._last_activity = time.monotonic()
+        self.thread = threading.Thread(target=self._idle_loop, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        self._wake.set()
+        if self.thread:
+            self.thread.join(timeout=1.0)
+        self.mode = "stopped"
+
+    def touch(self):
+        """Note motion from another source: postpones low power and wakes from hold"""
+        self._last_activity = time.monotonic()
+        if self.mode in ("low_power", "hold"):
+            self._wake.set()
+
+    def build(self):
+        """Precompute the loop table for the configured source"""
+        service = self.motor_service
+        names = service.MOTOR_NAMES
+        degrees = None
+        if self.source != "procedural":
+            recording = service.recording_cache.get(self.source, service.offsets)
+            if recording is not None and recording.frame_count > 1:
+                full = np.zeros((recording.frame_count, len(names)))
+                full[:, recording.motor_ids - 1] = recording.degrees
+                times = frame_times(recording.timestamps, recording.frame_count, service.fps)
+                degrees = recording_table(times, full, self.rate)
+            else:
+                logger.warning(f"Idle recording {self.source} not available, using procedural idle")
+        if degrees is None:
+            degrees = waveform_table(self.profile, names, self.rate, self.loop_s)
+
+        # Only claim joints that actually move, so idle never pins the others
+        moving = np.flatnonzero(np.ptp(degrees, axis=0) > 0) if len(degrees) > 1 else np.zeros(0, dtype=np.int64)
+        self._motor_ids = np.asarray(service.MOTOR_IDS)[moving]
+        self._table = degrees[:, moving] * TICKS_PER_DEGREE
+        self._table_rate = self.rate
+        logger.info(f"Idle table: {len(degrees)} samples at {self.rate} Hz for joints {self._motor_ids.tolist()}")
+
+    def _idle_loop(self):
+        service = self.motor_service
+        weight = 0.0
+        last_goals = None
+        start = time.monotonic()
+        ids = self._motor_ids.tolist()
+        while self.running:
+            now = time.monotonic()
+            if service._is_animating or not ids or service.bus.has_claim("tracking"):
+                # Don't leave a stale idle pose behind once something else takes over
+                if last_goals is not None:
+                    service.release_joints("idle")
+                    last_goals = None
+                weight = 0.0
+                self._last_activity = now
+                self.mode = "paused"
+                self._sleep(0.1)
+                continue
+
+            inactive = self.inactivity_timeout > 0 and now - self._last_activity >= self.inactivity_timeout
+            target = 0.0 if inactive and self.low_power == "hold" else 1.0
+            rate = self.low_power_rate if inactive and self.low_power == "rate" else self.rate
+            step = 1.0 / (rate * self.ramp_s) if self.ramp_s > 0 else 1.0
+            weight = min(target, weight + step) if weight < target else max(target, weight - step)
+
+            if target == 0.0 and weight == 0.0 and last_goals is not None:
+                # Parked at home: torque holds the pose, nothing to write until woken
+                self.mode = "hold"
+                self._sleep(1.0)
+                continue
+            self.mode = "low_power" if inactive else "active"
+
+            index = int((now - start) * self._table_rate) % len(self._table)
+            home = service._home_pose()[self._motor_ids - 1]
+            goals = np.clip(np.rint(home + weight * self._table[index]), 0, 4095).astype(np.int32).tolist()
+            if goals != last_goals:
+                service.claim_joints("idle", dict(zip(ids, goals)))
+                last_goals = goals
+                self.frames_claimed += 1
+            else:
+                self.frames_unchanged += 1
+
+            self._sleep(1.0 / rate - (time.monotonic() - now))
+
+    def _sleep(self, seconds: float):
+        if seconds > 0 and self._wake.wait(seconds):
+            self._wake.clear()
+
+    def get_stats(self) -> dict:
+        return {
+            "mode": self.mode,
+            "source": self.source,
+            "rate": self.rate,
+            "frames_claimed": self.frames_claimed,
+            "frames_unchanged": self.frames_unchanged,
+        }
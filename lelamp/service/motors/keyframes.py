@@ -0,0 +1,199 @@
+"""
+Keyframe/spline compression of recordings
+
+Each joint of a recording is reduced to the keyframes needed to reproduce
+it within a tolerance (Ramer-Douglas-Peucker on time/angle, refined until
+the spline fits) and interpolated with a monotone cubic Hermite spline, so
+the curve never overshoots between keys. The result can be evaluated at
+any time, i.e. at any playback rate.
+
+Keyframe file layout (little endian):
+    header      16 bytes, see _HEADER
+    joint names UTF-8, comma separated
+    per joint   uint32 key count
+    per joint   float32 times, float32 degrees
+
+Slopes are not stored; they are recomputed from the keys on load.
+"""
+import struct
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+
+KEYFRAME_EXTENSION = ".kf"
+
+MAGIC = b"LLKF"
+VERSION = 1
+DEFAULT_TOLERANCE = 0.3     # degrees
+MAX_REFINE = 50
+
+# magic, version, joints, duration, fps, names_len
+_HEADER = struct.Struct("<4sBBffH")
+
+
+def rdp_indices(times: np.ndarray, values: np.ndarray, tolerance: float) -> np.ndarray:
+    """Indices kept by Ramer-Douglas-Peucker with vertical (angle) error"""
+    n = len(values)
+    if n <= 2:
+        return np.arange(n)
+    keep = np.zeros(n, dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+    while stack:
+        a, b = stack.pop()
+        if b - a < 2:
+            continue
+        t = times[a + 1:b]
+        line = values[a] + (values[b] - values[a]) * (t - times[a]) / (times[b] - times[a])
+        error = np.abs(values[a + 1:b] - line)
+        i = int(np.argmax(error))
+        if error[i] > tolerance:
+            k = a + 1 + i
+            keep[k] = True
+            stack.append((a, k))
+            stack.append((k, b))
+    return np.flatnonzero(keep)
+
+
+def pchip_slopes(times: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """Fritsch-Carlson slopes: monotone between keys, flat at local extremes"""
+    n = len(values)
+    if n < 2:
+        return np.zeros(n)
+    h = np.diff(times)
+    delta = np.diff(values) / h
+    slopes = np.empty(n)
+    slopes[0], slopes[-1] = delta[0], delta[-1]
+    if n > 2:
+        w1 = 2 * h[1:] + h[:-1]
+        w2 = h[1:] + 2 * h[:-1]
+        same_sign = delta[:-1] * delta[1:] > 0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean = (w1 + w2) / (w1 / delta[:-1] + w2 / delta[1:])
+        slopes[1:-1] = np.where(same_sign, mean, 0.0)
+    return slopes
+
+
+def hermite(times: np.ndarray, values: np.ndarray, slopes: np.ndarray, query: np.ndarray) -> np.ndarray:
+    """Evaluate the cubic Hermite spline through (times, values, slopes) at query"""
+    n = len(values)
+    if n == 1:
+        return np.full(len(query), float(values[0]))
+    query = np.clip(query, times[0], times[-1])
+    i = np.clip(np.searchsorted(times, query, side='right') - 1, 0, n - 2)
+    h = times[i + 1] - times[i]
+    s = (query - times[i]) / h
+    s2 = s * s
+    s3 = s2 * s
+    return ((2 * s3 - 3 * s2 + 1) * values[i] + (s3 - 2 * s2 + s) * h * slopes[i]
+            + (3 * s2 - 2 * s3) * values[i + 1] + (s3 - s2) * h * slopes[i + 1])
+
+
+def fit_joint(times: np.ndarray, values: np.ndarray, tolerance: float):
+    """Keyframes (times, values, slopes) whose spline stays within tolerance of values"""
+    keys = rdp_indices(times, values, tolerance)
+    for _ in range(MAX_REFINE):
+        slopes = pchip_slopes(times[keys], values[keys])
+        error = np.abs(hermite(times[keys], values[keys], slopes, times) - values)
+        bad = np.flatnonzero(error > tolerance)
+        if len(bad) == 0:
+            break
+        # Add the worst sample of every segment that is out of tolerance
+        segment = np.searchsorted(times[keys], times[bad], side='right') - 1
+        order = np.lexsort((-error[bad], segment))
+        bad, segment = bad[order], segment[order]
+        first = np.r_[True, segment[1:] != segment[:-1]]
+        keys = np.union1d(keys, bad[first])
+    return times[keys].copy(), values[keys].copy(), pchip_slopes(times[keys], values[keys])
+
+
+@dataclass
+class KeyframeCurves:
+    """Per-joint keyframe splines of a recording"""
+    joints: List[str]
+    duration: float         # seconds
+    fps: float              # capture rate of the source recording
+    times: List[np.ndarray]
+    values: List[np.ndarray]
+    slopes: List[np.ndarray]
+
+    @property
+    def key_count(self) -> int:
+        return sum(len(t) for t in self.times)
+
+    def frame_times(self, fps: Optional[float] = None) -> np.ndarray:
+        """A regular grid over the whole recording, ending exactly at duration"""
+        fps = fps or self.fps
+        count = max(int(round(self.duration * fps)), 0) + 1
+        return np.minimum(np.arange(count, dtype=np.float64) / fps, self.duration)
+
+    def evaluate(self, query: np.ndarray) -> np.ndarray:
+        """Degrees of every joint at the query times (len(query) x joints)"""
+        query = np.asarray(query, dtype=np.float64)
+        out = np.empty((len(query), len(self.joints)), dtype=np.float64)
+        for j in range(len(self.joints)):
+            out[:, j] = hermite(self.times[j], self.values[j], self.slopes[j], query)
+        return out
+
+    def select(self, joints: List[str]) -> "KeyframeCurves":
+        """The curves of the given joints that exist, in that order"""
+        index = [self.joints.index(name) for name in joints if name in self.joints]
+        return KeyframeCurves(
+            [self.joints[i] for i in index], self.duration, self.fps,
+            [self.times[i] for i in index], [self.values[i] for i in index], [self.slopes[i] for i in index],
+        )
+
+
+def fit_keyframes(joints: List[str], times: np.ndarray, degrees: np.ndarray, fps: float,
+                  tolerance: float = DEFAULT_TOLERANCE) -> KeyframeCurves:
+    """Fit every joint of a (frames, joints) recording; times are seconds from the first frame"""
+    times = np.asarray(times, dtype=np.float64)
+    if len(times) > 1 and np.any(np.diff(times) <= 0):
+        times = np.arange(len(times), dtype=np.float64) / fps  # unusable timestamps
+    degrees = np.asarray(degrees, dtype=np.float64)
+    fitted = [fit_joint(times, degrees[:, j], tolerance) for j in range(len(joints))]
+    duration = float(times[-1]) if len(times) else 0.0
+    return KeyframeCurves(
+        list(joints), duration, float(fps),
+        [f[0] for f in fitted], [f[1] for f in fitted], [f[2] for f in fitted],
+    )
+
+
+def write_keyframes(path: str, curves: KeyframeCurves):
+    names = ",".join(curves.joints).encode("utf-8")
+    counts = np.array([len(t) for t in curves.times], dtype="<u4")
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, len(curves.joints), curves.duration, curves.fps, len(names)))
+        f.write(names)
+        f.write(counts.tobytes())
+        for j in range(len(curves.joints)):
+            for array in (curves.times[j], curves.values[j]):
+                f.write(np.ascontiguousarray(array, dtype="<f4").tobytes())
+
+
+def read_keyframes(path: str) -> KeyframeCurves:
+    with open(path, "rb") as f:
+        data = f.read()
+    if len(data) < _HEADER.size:
+        raise ValueError(f"Truncated keyframe header: {path}")
+    magic, version, joint_count, duration, fps, names_len = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError(f"Not a LeLamp keyframe file: {path}")
+    if version != VERSION:
+        raise ValueError(f"Unsupported keyframe version {version}: {path}")
+
+    offset = _HEADER.size
+    names = data[offset:offset + names_len].decode("utf-8")
+    offset += names_len
+    counts = np.frombuffer(data, dtype="<u4", count=joint_count, offset=offset)
+    offset += counts.nbytes
+
+    times, values = [], []
+    for count in counts.tolist():
+        for target in (times, values):
+            target.append(np.frombuffer(data, dtype="<f4", count=count, offset=offset).astype(np.float64))
+            offset += 4 * count
+    joints = names.split(",") if names else []
+    slopes = [pchip_slopes(t, v) for t, v in zip(times, values)]
+    return KeyframeCurves(joints, float(duration), float(fps), times, values, slopes)
@@ -0,0 +1,97 @@
+"""
+Per-joint velocity and acceleration limits
+
+The same limits are used twice: written once into each servo's goal-speed
+and acceleration registers, so the firmware ramps between goals however
+sparse they are, and applied on the host to every outgoing goal frame, so
+no source (animation start, a tracking jump) can command a step the joint
+could not follow.
+"""
+from dataclasses import dataclass
+from typing import Dict, Tuple
+
+TICKS_PER_DEGREE = 2048 / 180.0
+ACCELERATION_UNIT = 100.0   # STS3215 acceleration register: 100 ticks/s^2 per unit
+MAX_GAP = 0.2               # longer pauses between frames count as a restart from rest
+
+
+@dataclass(frozen=True)
+class JointLimits:
+    max_speed: float            # degrees/s
+    max_acceleration: float     # degrees/s^2
+
+    @property
+    def speed_register(self) -> int:
+        """Goal speed register value (ticks/s, 0 would mean unlimited)"""
+        return max(1, min(32767, int(round(self.max_speed * TICKS_PER_DEGREE))))
+
+    @property
+    def acceleration_register(self) -> int:
+        """Acceleration register value (units of 100 ticks/s^2, 0 would mean unlimited)"""
+        return max(1, min(254, int(round(self.max_acceleration * TICKS_PER_DEGREE / ACCELERATION_UNIT))))
+
+
+class MotionLimiter:
+    """Host-side speed/acceleration limiter for goal frames (ticks)
+
+    Each joint keeps the last goal it was sent and the velocity that implied.
+    A new goal is approached at most at max_speed, changing velocity by at
+    most max_acceleration; a step that reaches the goal lands exactly on it.
+    """
+
+    def __init__(self, limits: Dict[int, JointLimits]):
+        self.limits = {
+            motor_id: (lim.max_speed * TICKS_PER_DEGREE, lim.max_acceleration * TICKS_PER_DEGREE)
+            for motor_id, lim in limits.items()
+        }
+        self._state: Dict[int, Tuple[float, float, float]] = {}  # motor_id -> (position, velocity, time)
+        self.frames_limited = 0
+
+    def reset(self):
+        self._state.clear()
+
+    def seed(self, positions: Dict[int, int], now: float):
+        """Start joints without a history from these (measured) positions at rest"""
+        for motor_id, position in positions.items():
+            self._state.setdefault(motor_id, (float(position), 0.0, now))
+
+    def limit(self, goals: Dict[int, int], now: float) -> Tuple[Dict[int, int], bool]:
+        """Limited goals, and whether every joint reached its requested goal"""
+        out = {}
+        reached = True
+        for motor_id, goal in goals.items():
+            limits = self.limits.get(motor_id)
+            state = self._state.get(motor_id)
+            if limits is None or state is None:
+                # Unknown starting point: nothing to limit against
+                self._state[motor_id] = (float(goal), 0.0, now)
+                out[motor_id] = goal
+                continue
+
+            max_speed, max_accel = limits
+            position, velocity, last = state
+            dt = now - last
+            if dt <= 0:
+                out[motor_id] = int(round(position))
+                reached = reached and out[motor_id] == goal
+                continue
+            if dt > MAX_GAP:
+                velocity, dt = 0.0, MAX_GAP
+
+            error = goal - position
+            wanted = max(-max_speed, min(max_speed, error / dt))
+            dv = max(-max_accel * dt, min(max_accel * dt, wanted - velocity))
+            velocity += dv
+            step = velocity * dt
+            if error * step >= 0 and abs(step) >= abs(error):
+                position, velocity = float(goal), error / dt
+            else:
+                position += step
+            self._state[motor_id] = (position, velocity, now)
+            out[motor_id] = int(round(position))
+            if out[motor_id] != goal:
+                reached = False
+
+        if not reached:
+            self.frames_limited += 1
+        return out, reached
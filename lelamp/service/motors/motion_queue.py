@@ -0,0 +1,98 @@
+"""
+Motion command queue for DirectMotorsService
+Priority ordered, coalesces repeated requests, drops stale ones and lets the
+playback loop know when the running animation should be preempted.
+"""
+import heapq
+import itertools
+import threading
+import time
+from typing import Any, List, Optional, Tuple
+
+from ..base import Priority, ServiceEvent
+
+
+class MotionQueue:
+    """Priority queue of motion events with condition-variable wakeup.
+
+    - Events are served highest priority first (Priority.CRITICAL = 0), FIFO within a priority.
+    - A new "play" replaces any pending "play" of the same priority, so a burst of
+      requests collapses into the latest one instead of queueing up.
+    - "play" events older than max_age seconds are dropped when dequeued.
+    - should_preempt() tells the running animation to stop at the next frame when
+      a strictly higher priority event is waiting.
+    """
+
+    COALESCED_EVENTS = ("play", "home")
+
+    def __init__(self, max_age: float = 3.0):
+        self.max_age = max_age
+        self._heap: List[Tuple[int, int, float, ServiceEvent]] = []
+        self._counter = itertools.count()
+        self._cond = threading.Condition()
+        self._closed = False
+        self.dropped = 0     # stale events discarded
+        self.coalesced = 0   # pending events superseded by a newer one
+
+    def put(self, event_type: str, payload: Any, priority: Priority = Priority.NORMAL):
+        event = ServiceEvent(event_type, payload, priority)
+        with self._cond:
+            if event_type in self.COALESCED_EVENTS:
+                kept = [e for e in self._heap if not (e[3].event_type in self.COALESCED_EVENTS
+                                                      and e[3].priority == priority)]
+                if len(kept) != len(self._heap):
+                    self.coalesced += len(self._heap) - len(kept)
+                    self._heap = kept
+                    heapq.heapify(self._heap)
+            heapq.heappush(self._heap, (int(priority), next(self._counter), time.monotonic(), event))
+            self._cond.notify()
+
+    def get(self, timeout: Optional[float] = None) -> Optional[ServiceEvent]:
+        """Block until an event is available (or timeout/close). Returns None if none."""
+        with self._cond:
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while not self._closed:
+                while self._heap:
+                    _, _, created, event = heapq.heappop(self._heap)
+                    if self._is_stale(event, created):
+                        self.dropped += 1
+                        continue
+                    return event
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+            return None
+
+    def _is_stale(self, event: ServiceEvent, created: float) -> bool:
+        return event.event_type == "play" and time.monotonic() - created > self.max_age
+
+    def peek(self) -> Optional[ServiceEvent]:
+        """Next event that get() would return, without removing it (stale events are dropped)"""
+        with self._cond:
+            while self._heap:
+                _, _, created, event = self._heap[0]
+                if not self._is_stale(event, created):
+                    return event
+                heapq.heappop(self._heap)
+                self.dropped += 1
+            return None
+
+    def should_preempt(self, priority: Priority) -> bool:
+        """True if an event with strictly higher priority than `priority` is pending"""
+        with self._cond:
+            return bool(self._heap) and self._heap[0][0] < int(priority)
+
+    def clear(self):
+        with self._cond:
+            self._heap.clear()
+
+    def close(self):
+        """Wake up any waiting consumer; get() returns None from now on"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def __len__(self) -> int:
+        with self._cond:
+            return len(self._heap)
@@ -0,0 +1,127 @@
+"""
+Allocation-free goal-position packet encoding
+
+Goal writes are the hot path on the servo bus: one SYNC_WRITE per frame
+during playback. Instead of building a fresh packet (and summing its params
+for the checksum) on every write, the encoders here keep a preallocated
+bytearray per packet shape and patch only the changing bytes in place; the
+constant part of the checksum is summed once.
+
+encode_goal_frames() encodes a whole animation (frames x joints) into one
+contiguous buffer in a few NumPy operations, so playback can send each
+frame as a memoryview slice without touching Python ints per byte.
+"""
+from dataclasses import dataclass
+from typing import Dict, Iterable
+
+import numpy as np
+
+INST_WRITE = 0x03
+INST_SYNC_WRITE = 0x83
+BROADCAST_ID = 0xFE
+ADDR_GOAL_POSITION = 42
+POSITION_BYTES = 2
+
+
+class SyncWriteEncoder:
+    """Reusable SYNC_WRITE goal-position packet for up to max_motors servos
+
+    The returned memoryview aliases an internal buffer: write it to the port
+    before the next encode() call.
+    """
+
+    def __init__(self, max_motors: int, address: int = ADDR_GOAL_POSITION):
+        self.max_motors = max_motors
+        self._buf = bytearray(8 + 3 * max_motors)
+        self._buf[0:3] = b"\xff\xff" + bytes([BROADCAST_ID])
+        self._buf[4:7] = bytes([INST_SYNC_WRITE, address, POSITION_BYTES])
+        self._view = memoryview(self._buf)
+        self._header_sum = BROADCAST_ID + INST_SYNC_WRITE + address + POSITION_BYTES
+
+    def encode(self, goals: Dict[int, int]) -> memoryview:
+        """Packet setting {motor_id: position}; positions must already be 0-4095"""
+        buf = self._buf
+        total = 0
+        offset = 7
+        for motor_id, position in goals.items():
+            lo = position & 0xFF
+            hi = position >> 8
+            buf[offset] = motor_id
+            buf[offset + 1] = lo
+            buf[offset + 2] = hi
+            total += motor_id + lo + hi
+            offset += 3
+        length = offset - 3  # (3 bytes per motor) + addr + width + inst + checksum
+        buf[3] = length
+        buf[offset] = ~(self._header_sum + length + total) & 0xFF
+        return self._view[:offset + 1]
+
+
+class PositionWriteEncoder:
+    """Per-motor WRITE goal-position templates (for single-motor writes)"""
+
+    def __init__(self, motor_ids: Iterable[int], address: int = ADDR_GOAL_POSITION):
+        self.address = address
+        self._templates: Dict[int, bytearray] = {}
+        self._sums: Dict[int, int] = {}
+        for motor_id in motor_ids:
+            self._add(motor_id)
+
+    def _add(self, motor_id: int) -> bytearray:
+        packet = bytearray([0xFF, 0xFF, motor_id, 5, INST_WRITE, self.address, 0, 0, 0])
+        self._templates[motor_id] = packet
+        self._sums[motor_id] = motor_id + 5 + INST_WRITE + self.address
+        return packet
+
+    def encode(self, motor_id: int, position: int) -> bytearray:
+        """Packet setting one motor's goal; position must already be 0-4095"""
+        packet = self._templates.get(motor_id) or self._add(motor_id)
+        lo = position & 0xFF
+        hi = position >> 8
+        packet[6] = lo
+        packet[7] = hi
+        packet[8] = ~(self._sums[motor_id] + lo + hi) & 0xFF
+        return packet
+
+
+@dataclass
+class EncodedFrames:
+    """Wire bytes of consecutive SYNC_WRITE frames in one contiguous buffer"""
+    motor_ids: tuple
+    data: np.ndarray        # (frames, packet_len) uint8
+    positions: np.ndarray   # (frames, joints) int32, the encoded goals
+
+    def __post_init__(self):
+        self.packet_len = self.data.shape[1] if self.data.ndim == 2 else 0
+        self._view = memoryview(np.ascontiguousarray(self.data).reshape(-1))
+
+    @property
+    def frame_count(self) -> int:
+        return len(self.data)
+
+    def packet(self, index: int) -> memoryview:
+        start = index * self.packet_len
+        return self._view[start:start + self.packet_len]
+
+
+def encode_goal_frames(motor_ids: Iterable[int], frames: np.ndarray,
+                       address: int = ADDR_GOAL_POSITION) -> EncodedFrames:
+    """Encode frames (frames x joints, ticks) as SYNC_WRITE packets, checksums vectorized"""
+    motor_ids = tuple(motor_ids)
+    positions = np.clip(np.rint(np.asarray(frames, dtype=np.float64)), 0, 4095).astype(np.int32)
+    positions = positions.reshape(-1, len(motor_ids))
+    count, joints = positions.shape
+
+    data = np.empty((count, 8 + 3 * joints), dtype=np.uint8)
+    data[:, 0] = 0xFF
+    data[:, 1] = 0xFF
+    data[:, 2] = BROADCAST_ID
+    data[:, 3] = 3 * joints + 4
+    data[:, 4] = INST_SYNC_WRITE
+    data[:, 5] = address
+    data[:, 6] = POSITION_BYTES
+    data[:, 7:-1:3] = motor_ids
+    data[:, 8:-1:3] = positions & 0xFF
+    data[:, 9:-1:3] = positions >> 8
+    data[:, -1] = ~data[:, 2:-1].sum(axis=1, dtype=np.int64) & 0xFF
+    return EncodedFrames(motor_ids, data, positions)
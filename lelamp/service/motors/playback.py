@@ -0,0 +1,167 @@
+"""
+Deadline-based playback scheduler for DirectMotorsService
+
+Frames are emitted against absolute monotonic deadlines measured from the
+start of playback, so a slow frame never pushes back the ones after it.
+When playback falls behind, frames that are already past due are skipped
+and the emitted pose is interpolated to the actual send time.
+"""
+import time
+import logging
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PlaybackStats:
+    """Timing statistics for one playback of an animation"""
+    name: str
+    frames_total: int = 0
+    frames_sent: int = 0
+    frames_skipped: int = 0
+    overruns: int = 0               # frames whose send took longer than one frame period
+    jitter_mean_ms: float = 0.0     # mean lateness of sent frames vs their deadline
+    jitter_p95_ms: float = 0.0
+    jitter_max_ms: float = 0.0
+    planned_s: float = 0.0          # duration implied by the frame times
+    actual_s: float = 0.0           # wall-clock duration of playback
+    preempted: bool = False         # stopped early by should_stop()
+
+    def as_dict(self) -> dict:
+        return dict(self.__dict__)
+
+
+def frame_times(timestamps: Optional[np.ndarray], frame_count: int, fps: float) -> np.ndarray:
+    """Playback time of each frame in seconds, relative to the first frame.
+
+    Uses the recorded timestamps when they are present and non-decreasing,
+    otherwise falls back to a fixed 1/fps grid.
+    """
+    if timestamps is not None and len(timestamps) == frame_count and frame_count > 1:
+        rel = np.asarray(timestamps, dtype=np.float64) - float(timestamps[0])
+        if rel[-1] > 0 and np.all(np.diff(rel) >= 0):
+            return rel
+    return np.arange(frame_count, dtype=np.float64) / fps
+
+
+def sample_frames(times: np.ndarray, frames: np.ndarray, query: np.ndarray) -> np.ndarray:
+    """Linearly interpolate all joints of a trajectory at the query times"""
+    n = len(frames)
+    if n == 1:
+        return np.repeat(frames.astype(np.float64), len(query), axis=0)
+    query = np.clip(query, times[0], times[-1])
+    idx = np.clip(np.searchsorted(times, query, side='right') - 1, 0, n - 2)
+    t0 = times[idx]
+    span = times[idx + 1] - t0
+    alpha = np.divide(query - t0, span, out=np.zeros_like(query), where=span > 0)
+    f0 = frames[idx].astype(np.float64)
+    return f0 + (frames[idx + 1] - f0) * alpha[:, None]
+
+
+def warp_times(length: float, fps: float, rate: float = 1.0, duration: Optional[float] = None):
+    """Output frame times on a 1/fps grid and the source times they sample.
+
+    rate > 1 speeds playback up; duration (seconds) overrides rate and
+    stretches or squeezes a recording of the given length to that duration.
+    """
+    if duration is not None and not duration > 0:
+        raise ValueError(f"Playback duration must be positive, got {duration}")
+    if duration is not None and length > 0:
+        rate = length / duration
+    if rate <= 0:
+        raise ValueError(f"Playback rate must be positive, got {rate}")
+
+    out_length = length / rate
+    count = max(int(round(out_length * fps)), 0) + 1
+    out_times = np.minimum(np.arange(count, dtype=np.float64) / fps, out_length)
+    return out_times, out_times * rate
+
+
+def time_warp(times: np.ndarray, frames: np.ndarray, fps: float,
+              rate: float = 1.0, duration: Optional[float] = None):
+    """Resample a trajectory onto a 1/fps grid, played back faster or slower.
+
+    Returns (times, frames) with frames rounded to integer ticks; see warp_times.
+    """
+    length = float(times[-1]) if len(times) else 0.0
+    out_times, source_times = warp_times(length, fps, rate, duration)
+    out_frames = sample_frames(times, frames, source_times)
+    return out_times, np.rint(out_frames).astype(np.int32)
+
+
+class PlaybackScheduler:
+    """Emits animation frames on absolute deadlines with drift compensation"""
+
+    def __init__(self, interpolate: bool = True,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.interpolate = interpolate
+        self.clock = clock
+        self.sleep = sleep
+        self.frame_index = -1  # index into frames of the frame being emitted
+
+    def run(self, name: str, times: np.ndarray, frames: np.ndarray,
+            emit: Callable[[np.ndarray], None],
+            should_stop: Optional[Callable[[], bool]] = None) -> PlaybackStats:
+        """Play frames (frames x joints) at the given relative times through emit().
+
+        should_stop is polled at every frame boundary; returning True ends
+        playback early and marks the stats as preempted. While emit() runs,
+        frame_index is the index of the (possibly interpolated) frame.
+        """
+        n = len(frames)
+        stats = PlaybackStats(name=name, frames_total=n)
+        if n == 0:
+            return stats
+
+        stats.planned_s = float(times[-1])
+        period = float(np.median(np.diff(times))) if n > 1 else 0.0
+        lateness = []
+
+        start = self.clock()
+        k = 0
+        while k < n:
+            if should_stop is not None and should_stop():
+                stats.preempted = True
+                break
+            deadline = start + times[k]
+            now = self.clock()
+            if now < deadline:
+                self.sleep(deadline - now)
+                now = self.clock()
+
+            # Catch up: jump to the latest frame that is already due
+            elapsed = now - start
+            due = int(np.searchsorted(times, elapsed, side='right')) - 1
+            if due > k:
+                stats.frames_skipped += due - k
+                k = due
+
+            late = elapsed - times[k]
+            frame = frames[k]
+            if self.interpolate and late > 0 and k + 1 < n:
+                span = times[k + 1] - times[k]
+                if span > 0:
+                    alpha = min(late / span, 1.0)
+                    frame = frames[k] + (frames[k + 1] - frames[k]) * alpha
+
+            self.frame_index = k
+            emit(frame)
+            stats.frames_sent += 1
+            lateness.append(late)
+            if period > 0 and self.clock() - now > period:
+                stats.overruns += 1
+            k += 1
+
+        stats.actual_s = self.clock() - start
+        if not lateness:
+            return stats
+        late_ms = np.maximum(np.array(lateness), 0.0) * 1000
+        stats.jitter_mean_ms = float(late_ms.mean())
+        stats.jitter_p95_ms = float(np.percentile(late_ms, 95))
+        stats.jitter_max_ms = float(late_ms.max())
+        return stats
@@ -0,0 +1,10 @@
+"""
+pyserial URL handler for sts3215:// ports (see sts_emulator)
+
+pyserial looks up `protocol_<scheme>.Serial` in the packages listed in
+serial.protocol_handler_packages; DirectMotorsService registers this package
+when its port is an sts3215:// URL.
+"""
+from .sts_emulator import EmulatedSerial as Serial
+
+__all__ = ['Serial']
@@ -0,0 +1,244 @@
+"""
+Recording cache for DirectMotorsService
+Parses recordings once into NumPy arrays of precomputed goal ticks so
+playback only has to index arrays instead of re-reading CSV files
+"""
+import os
+import csv
+import glob
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .animation_file import ANIMATION_EXTENSION, read_animation
+from .keyframes import KEYFRAME_EXTENSION, KeyframeCurves, read_keyframes
+
+logger = logging.getLogger(__name__)
+
+# When a recording exists in several formats the newest file wins, so a fresh
+# take is never shadowed by an older compiled file; on equal mtimes keyframes
+# go first, then binary animations, then CSV
+RECORDING_EXTENSIONS = (KEYFRAME_EXTENSION, ANIMATION_EXTENSION, ".csv")
+# Formats a take is captured or cleaned in; keyframe files are fitted from these
+SOURCE_EXTENSIONS = (ANIMATION_EXTENSION, ".csv")
+
+
+def recording_precedence(path: str, mtime: float) -> Tuple[float, int]:
+    """Sort key among the files of one recording: the smallest one is played"""
+    return -mtime, RECORDING_EXTENSIONS.index(os.path.splitext(path)[1])
+
+
+def find_recording(recordings_dir: str, name: str) -> Optional[str]:
+    """Path of the file a recording plays from, or None"""
+    found = []
+    for ext in RECORDING_EXTENSIONS:
+        path = os.path.join(recordings_dir, f"{name}{ext}")
+        try:
+            found.append((recording_precedence(path, os.path.getmtime(path)), path))
+        except OSError:
+            continue
+    return min(found)[1] if found else None
+
+
+def find_recordings(recordings_dir: str, extensions: Sequence[str] = RECORDING_EXTENSIONS) -> Dict[str, str]:
+    """Path each recording plays from, by name, considering only the given formats"""
+    found: Dict[str, Tuple[Tuple[float, int], str]] = {}
+    for ext in extensions:
+        for path in glob.glob(os.path.join(recordings_dir, f"*{ext}")):
+            name = os.path.splitext(os.path.basename(path))[0]
+            key = recording_precedence(path, os.path.getmtime(path))
+            if name not in found or key < found[name][0]:
+                found[name] = (key, path)
+    return {name: path for name, (_, path) in found.items()}
+
+
+@dataclass
+class CompiledRecording:
+    """A recording compiled to servo goal ticks"""
+    name: str
+    path: str
+    motor_ids: np.ndarray               # (joints,) servo id of each column
+    degrees: np.ndarray                 # (frames, joints) recorded angles in degrees
+    ticks: np.ndarray                   # (frames, joints) int32 goal positions, 0-4095
+    timestamps: Optional[np.ndarray]    # (frames,) recorded timestamps in seconds
+    mtime: float
+    offsets: Tuple[int, ...]            # offsets the ticks were compiled against
+    curves: Optional[KeyframeCurves] = None  # keyframe recordings: splines behind degrees
+
+    @property
+    def frame_count(self) -> int:
+        return len(self.ticks)
+
+    def frame(self, index: int) -> Dict[int, int]:
+        """Goal frame {motor_id: position} for a single frame index"""
+        return dict(zip(self.motor_ids.tolist(), self.ticks[index].tolist()))
+
+    def ticks_at(self, times: np.ndarray) -> np.ndarray:
+        """Goal ticks evaluated from the keyframe splines at any times (seconds)"""
+        offsets = np.array(self.offsets, dtype=np.float64)[self.motor_ids - 1]
+        return compile_ticks(self.curves.evaluate(times), offsets, reference=self.degrees[0])
+
+
+def read_csv_recording(path: str, motor_names: List[str]) -> Tuple[List[str], Optional[np.ndarray], np.ndarray]:
+    """Read a recording CSV into (joint names, timestamps, degrees matrix)"""
+    with open(path, 'r') as csvfile:
+        reader = csv.reader(csvfile)
+        header = next(reader, [])
+        rows = [row for row in reader if row]
+
+    columns = {key: i for i, key in enumerate(header)}
+    joints = [name for name in motor_names if f"{name}.pos" in columns]
+    table = np.array(rows, dtype=np.float64).reshape(len(rows), len(header))
+
+    degrees = table[:, [columns[f"{name}.pos"] for name in joints]]
+    timestamps = table[:, columns["timestamp"]] if "timestamp" in columns else None
+    return joints, timestamps, degrees
+
+
+def read_binary_recording(path: str, motor_names: List[str]) -> Tuple[List[str], Optional[np.ndarray], np.ndarray]:
+    """Read a binary animation into (joint names, timestamps, degrees matrix)"""
+    animation = read_animation(path)
+    joints = [name for name in motor_names if name in animation.joints]
+    columns = [animation.joints.index(name) for name in joints]
+    degrees = animation.degrees()
+    if columns != list(range(degrees.shape[1])):
+        degrees = degrees[:, columns]
+    return joints, animation.timestamps, degrees
+
+
+def read_keyframe_recording(path: str, motor_names: List[str],
+                            fps: Optional[float] = None) -> Tuple[List[str], Optional[np.ndarray], np.ndarray]:
+    """Evaluate a keyframe file on a regular grid (default: its capture rate)"""
+    curves = read_keyframes(path).select(motor_names)
+    timestamps = curves.frame_times(fps)
+    return curves.joints, timestamps, curves.evaluate(timestamps)
+
+
+def read_recording(path: str, motor_names: List[str]) -> Tuple[List[str], Optional[np.ndarray], np.ndarray]:
+    """Read a recording in CSV, binary animation or keyframe format"""
+    if path.endswith(KEYFRAME_EXTENSION):
+        return read_keyframe_recording(path, motor_names)
+    if path.endswith(ANIMATION_EXTENSION):
+        return read_binary_recording(path, motor_names)
+    return read_csv_recording(path, motor_names)
+
+
+def compile_ticks(degrees: np.ndarray, offsets: np.ndarray, reference: Optional[np.ndarray] = None) -> np.ndarray:
+    """Convert recorded degrees to goal ticks relative to the first frame.
+
+    position = offset + (frame_degrees - first_frame_degrees) / 180 * 2048,
+    truncated and clamped to the 0-4095 servo range. reference replaces the
+    first frame when degrees is only part of a recording.
+    """
+    if len(degrees) == 0:
+        return np.empty((0, len(offsets)), dtype=np.int32)
+    delta = degrees.astype(np.float64) - (degrees[0] if reference is None else reference)
+    ticks = np.trunc(offsets + (delta / 180.0) * 2048)
+    return np.ascontiguousarray(np.clip(ticks, 0, 4095).astype(np.int32))
+
+
+class RecordingCache:
+    """In-memory cache of compiled recordings, keyed by recording name.
+
+    Entries are recompiled when the recording file changes on disk or when
+    the motor offsets they were compiled against change. With a catalog
+    (RecordingCatalog), names and paths come from its index instead of the
+    directory, and entries it reports as changed are dropped.
+    """
+
+    def __init__(self, recordings_dir: str, motor_names: List[str], fps: float = 30, catalog=None):
+        self.recordings_dir = recordings_dir
+        self.motor_names = list(motor_names)
+        self.fps = fps  # keyframe recordings are evaluated at this rate
+        self.catalog = catalog
+        self._recordings: Dict[str, CompiledRecording] = {}
+        self._lock = threading.Lock()
+        if catalog is not None:
+            catalog.subscribe(lambda names: [self.invalidate(name) for name in names])
+
+    def load_all(self, offsets: Dict[str, int]) -> int:
+        """Compile every recording in the recordings directory. Returns count loaded."""
+        if not os.path.exists(self.recordings_dir):
+            return 0
+        loaded = 0
+        for name in self.list_names():
+            if self.get(name, offsets) is not None:
+                loaded += 1
+        logger.info(f"Recording cache loaded {loaded} recordings")
+        return loaded
+
+    def get(self, name: str, offsets: Dict[str, int]) -> Optional[CompiledRecording]:
+        """Return the compiled recording, (re)compiling it if stale"""
+        path = self._find_path(name)
+        if path is None:
+            with self._lock:
+                self._recordings.pop(name, None)
+            return None
+
+        offsets_key = tuple(int(offsets.get(n, 2048)) for n in self.motor_names)
+        mtime = os.path.getmtime(path)
+        with self._lock:
+            recording = self._recordings.get(name)
+        if (recording is not None and recording.path == path
+                and recording.mtime == mtime and recording.offsets == offsets_key):
+            return recording
+
+        try:
+            recording = self._compile(name, path, mtime, offsets_key)
+        except Exception as e:
+            logger.error(f"Could not load recording {name}: {e}")
+            return None
+        with self._lock:
+            self._recordings[name] = recording
+        return recording
+
+    def invalidate(self, name: Optional[str] = None):
+        """Drop one cached recording, or all of them"""
+        with self._lock:
+            if name is None:
+                self._recordings.clear()
+            else:
+                self._recordings.pop(name, None)
+
+    def _compile(self, name: str, path: str, mtime: float, offsets_key: Tuple[int, ...]) -> CompiledRecording:
+        curves = None
+        if path.endswith(KEYFRAME_EXTENSION):
+            curves = read_keyframes(path).select(self.motor_names)
+            joints, timestamps = curves.joints, curves.frame_times(self.fps)
+            degrees = curves.evaluate(timestamps)
+        else:
+            joints, timestamps, degrees = read_recording(path, self.motor_names)
+        index = [self.motor_names.index(j) for j in joints]
+        offsets = np.array([offsets_key[i] for i in index], dtype=np.float64)
+        return CompiledRecording(
+            name=name,
+            path=path,
+            motor_ids=np.array([i + 1 for i in index], dtype=np.int32),
+            degrees=degrees,
+            ticks=compile_ticks(degrees, offsets),
+            timestamps=timestamps,
+            mtime=mtime,
+            offsets=offsets_key,
+            curves=curves,
+        )
+
+    def _find_path(self, name: str) -> Optional[str]:
+        if self.catalog is not None:
+            return self.catalog.path(name)
+        return find_recording(self.recordings_dir, name)
+
+    def list_names(self) -> List[str]:
+        """Names of all recordings on disk, in any supported format"""
+        if self.catalog is not None:
+            return self.catalog.list_names()
+        if not os.path.exists(self.recordings_dir):
+            return []
+        names = set()
+        for filename in os.listdir(self.recordings_dir):
+            base, ext = os.path.splitext(filename)
+            if ext in RECORDING_EXTENSIONS:
+                names.add(base)
+        return sorted(names)
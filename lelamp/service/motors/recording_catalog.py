@@ -0,0 +1,240 @@
+"""
+Recording catalog: an index of the recordings directory
+
+Keeps per-recording metadata (frames, duration, joint ranges, checksum,
+mtime) in memory and in a manifest sidecar (recordings/.manifest.json), so
+listing recordings only needs the index. The directory is rescanned with
+os.scandir, which only stats files; a file's contents are read once, when
+it is new or its size/mtime changed. watch() polls in the background and
+notifies subscribers of the names that changed.
+"""
+import os
+import json
+import hashlib
+import tempfile
+import threading
+import logging
+from dataclasses import dataclass, asdict, field
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from .playback import frame_times
+from .recording_cache import RECORDING_EXTENSIONS, read_recording, recording_precedence
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = ".manifest.json"
+MANIFEST_VERSION = 1
+
+
+@dataclass
+class RecordingInfo:
+    name: str
+    filename: str
+    size: int
+    mtime: float
+    checksum: str                   # sha1 of the file contents
+    frames: int = 0
+    duration: float = 0.0           # seconds
+    fps: float = 0.0
+    joints: Dict[str, List[float]] = field(default_factory=dict)  # joint -> [min, max] degrees
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+def _file_checksum(path: str) -> str:
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(65536), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def describe_recording(name: str, path: str, motor_names: List[str], default_fps: float = 30) -> RecordingInfo:
+    """Read a recording once and summarize it"""
+    stat = os.stat(path)
+    joints, timestamps, degrees = read_recording(path, motor_names)
+    frames = len(degrees)
+    times = frame_times(timestamps, frames, default_fps) if frames else np.zeros(0)
+    duration = float(times[-1]) if frames else 0.0
+    dt = np.diff(times)
+    dt = dt[dt > 0]
+    return RecordingInfo(
+        name=name,
+        filename=os.path.basename(path),
+        size=stat.st_size,
+        mtime=stat.st_mtime,
+        checksum=_file_checksum(path),
+        frames=frames,
+        duration=duration,
+        fps=float(1.0 / np.median(dt)) if len(dt) else float(default_fps),
+        joints={j: [float(degrees[:, i].min()), float(degrees[:, i].max())]
+                for i, j in enumerate(joints)} if frames else {},
+    )
+
+
+class RecordingCatalog:
+    """Incrementally updated index of a recordings directory"""
+
+    def __init__(self, recordings_dir: str, motor_names: List[str], manifest: bool = True):
+        self.recordings_dir = recordings_dir
+        self.motor_names = list(motor_names)
+        self.manifest_path = os.path.join(recordings_dir, MANIFEST_NAME) if manifest else None
+        self._entries: Dict[str, RecordingInfo] = {}
+        self._files: Dict[str, float] = {}  # mtime of every recording file, shadowed ones too
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[List[str]], None]] = []
+        self._watching = False
+        self._thread = None
+        self._stop = threading.Event()
+        self._load_manifest()
+
+    def _load_manifest(self):
+        if not self.manifest_path or not os.path.exists(self.manifest_path):
+            return
+        try:
+            with open(self.manifest_path, 'r') as f:
+                data = json.load(f)
+            if data.get("version") != MANIFEST_VERSION:
+                return
+            self._entries = {name: RecordingInfo(**info) for name, info in data.get("recordings", {}).items()}
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable recording manifest: {e}")
+
+    def _save_manifest(self):
+        if not self.manifest_path:
+            return
+        data = {
+            "version": MANIFEST_VERSION,
+            "recordings": {name: info.as_dict() for name, info in sorted(self._entries.items())},
+        }
+        # A temp file of our own: the service and the CLI tools may save at the same time
+        tmp = None
+        try:
+            with tempfile.NamedTemporaryFile('w', dir=os.path.dirname(self.manifest_path),
+                                             prefix=MANIFEST_NAME, suffix=".tmp", delete=False) as f:
+                tmp = f.name
+                json.dump(data, f, indent=1)
+            os.replace(tmp, self.manifest_path)
+        except OSError as e:
+            logger.warning(f"Could not write recording manifest: {e}")
+            if tmp is not None and os.path.exists(tmp):
+                os.remove(tmp)
+
+    def _scan(self) -> Dict[str, os.DirEntry]:
+        """Winning file per recording name (stat only, see recording_precedence)"""
+        found: Dict[str, os.DirEntry] = {}
+        files: Dict[str, float] = {}
+        try:
+            entries = list(os.scandir(self.recordings_dir))
+        except FileNotFoundError:
+            entries = []
+        for entry in entries:
+            base, ext = os.path.splitext(entry.name)
+            if ext not in RECORDING_EXTENSIONS or not entry.is_file():
+                continue
+            files[entry.name] = entry.stat().st_mtime
+            current = found.get(base)
+            if current is None or (recording_precedence(entry.name, files[entry.name])
+                                   < recording_precedence(current.name, files[current.name])):
+                found[base] = entry
+        self._files = files
+        return found
+
+    def refresh(self) -> List[str]:
+        """Bring the index up to date with the directory. Returns the names that changed."""
+        found = self._scan()
+        changed = []
+        with self._lock:
+            for name in list(self._entries):
+                if name not in found:
+                    del self._entries[name]
+                    changed.append(name)
+            for name, entry in found.items():
+                stat = entry.stat()
+                info = self._entries.get(name)
+                if (info is not None and info.filename == entry.name
+                        and info.mtime == stat.st_mtime and info.size == stat.st_size):
+                    continue
+                try:
+                    self._entries[name] = describe_recording(name, entry.path, self.motor_names)
+                except Exception as e:
+                    logger.error(f"Could not index recording {entry.name}: {e}")
+                    self._entries.pop(name, None)
+                changed.append(name)
+            if changed:
+                self._save_manifest()
+
+        if changed:
+            for callback in self._listeners:
+                try:
+                    callback(changed)
+                except Exception as e:
+                    logger.error(f"Recording catalog listener failed: {e}")
+        return changed
+
+    def subscribe(self, callback: Callable[[List[str]], None]):
+        """Call callback(changed_names) whenever a refresh finds changes"""
+        self._listeners = self._listeners + [callback]
+
+    def watch(self, interval: float = 2.0):
+        """Poll the directory for changes in a background thread"""
+        if self._watching:
+            return
+        self._watching = True
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch_loop, args=(interval,), daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._watching = False
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=1.0)
+
+    def _watch_loop(self, interval: float):
+        dir_mtime = None
+        while self._watching:
+            try:
+                # Cheap check first: adding, removing or renaming changes the directory mtime
+                mtime = os.stat(self.recordings_dir).st_mtime
+                if mtime != dir_mtime:
+                    dir_mtime = mtime
+                    self.refresh()
+                else:
+                    self._refresh_if_modified()
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                logger.error(f"Recording catalog refresh failed: {e}")
+            self._stop.wait(interval)
+
+    def _refresh_if_modified(self):
+        """Refresh only if a recording file was rewritten in place (a shadowed
+        one too: rewriting it makes it the newest, so it takes over)"""
+        for filename, mtime in list(self._files.items()):
+            try:
+                if os.stat(os.path.join(self.recordings_dir, filename)).st_mtime != mtime:
+                    self.refresh()
+                    return
+            except FileNotFoundError:
+                self.refresh()
+                return
+
+    def list_names(self) -> List[str]:
+        with self._lock:
+            return sorted(self._entries)
+
+    def get(self, name: str) -> Optional[RecordingInfo]:
+        with self._lock:
+            return self._entries.get(name)
+
+    def path(self, name: str) -> Optional[str]:
+        info = self.get(name)
+        return os.path.join(self.recordings_dir, info.filename) if info else None
+
+    def entries(self) -> List[RecordingInfo]:
+        with self._lock:
+            return [self._entries[name] for name in sorted(self._entries)]
@@ -0,0 +1,123 @@
+"""
+Post-processing of captured recordings
+
+Recordings straight from lelamp/record.py start and end with the lamp
+sitting still and carry a little sensor jitter. Cleaning a recording:
+
+    smooth   zero-phase Gaussian filter (symmetric kernel, so no lag)
+    trim     drop the still lead-in and tail, keeping one rest frame at each end
+    dedupe   drop the interior frames of runs that hold the same pose; the run's
+             first and last frame stay, so the timing and interpolation are unchanged
+    rebase   timestamps start at 0
+
+All steps work on the whole (frames, joints) matrix at once.
+"""
+from dataclasses import dataclass, asdict
+from typing import Optional, Tuple
+
+import numpy as np
+
+DEFAULT_SMOOTH_SIGMA = 1.5      # frames
+DEFAULT_IDLE_THRESHOLD = 0.5    # degrees from the rest pose that count as motion
+DEFAULT_DUPLICATE_TOLERANCE = 0.05  # degrees
+
+
+@dataclass
+class CleanupReport:
+    frames_in: int = 0
+    frames_out: int = 0
+    head_trimmed: int = 0
+    tail_trimmed: int = 0
+    duplicates_removed: int = 0
+    duration_in: float = 0.0     # seconds
+    duration_out: float = 0.0
+    time_to_motion_in: float = 0.0   # seconds until the first frame that moves
+    time_to_motion_out: float = 0.0
+    max_smoothing_error: float = 0.0  # degrees
+
+    @property
+    def frames_removed(self) -> int:
+        return self.frames_in - self.frames_out
+
+    def as_dict(self) -> dict:
+        return {**asdict(self), "frames_removed": self.frames_removed}
+
+
+def smooth(degrees: np.ndarray, sigma: float) -> np.ndarray:
+    """Zero-phase Gaussian smoothing along time, edges padded with the end frames"""
+    if sigma <= 0 or len(degrees) < 3:
+        return degrees.copy()
+    radius = max(int(np.ceil(3 * sigma)), 1)
+    offsets = np.arange(-radius, radius + 1)
+    kernel = np.exp(-0.5 * (offsets / sigma) ** 2)
+    kernel /= kernel.sum()
+    padded = np.pad(degrees, ((radius, radius), (0, 0)), mode='edge')
+    windows = np.lib.stride_tricks.sliding_window_view(padded, len(kernel), axis=0)  # (frames, joints, taps)
+    return windows @ kernel
+
+
+def first_motion(degrees: np.ndarray, threshold: float) -> Optional[int]:
+    """Index of the first frame more than threshold away from the first frame"""
+    moving = np.abs(degrees - degrees[0]).max(axis=1) > threshold
+    return int(np.argmax(moving)) if moving.any() else None
+
+
+def trim_idle(degrees: np.ndarray, threshold: float) -> Tuple[int, int]:
+    """[start, stop) slice without the still lead-in and tail (one rest frame kept at each end)"""
+    first = first_motion(degrees, threshold)
+    if first is None:
+        return 0, len(degrees)  # never moves: nothing sensible to trim
+    last = len(degrees) - 1 - first_motion(degrees[::-1], threshold)
+    return max(first - 1, 0), min(last + 2, len(degrees))
+
+
+def duplicate_mask(degrees: np.ndarray, tolerance: float) -> np.ndarray:
+    """True for frames to keep: everything but the interior of runs holding one pose"""
+    n = len(degrees)
+    keep = np.ones(n, dtype=bool)
+    if n < 3:
+        return keep
+    # still[i]: frame i is within tolerance of frame i - 1
+    still = np.zeros(n, dtype=bool)
+    still[1:] = np.abs(np.diff(degrees, axis=0)).max(axis=1) <= tolerance
+    # Anchor of each run: the last frame that moved; slow drifts never stray from it by more than tolerance
+    anchor = np.maximum.accumulate(np.where(still, 0, np.arange(n)))
+    near_anchor = np.abs(degrees - degrees[anchor]).max(axis=1) <= tolerance
+    interior = still[:-1] & still[1:] & near_anchor[:-1]
+    keep[:-1] &= ~interior
+    keep[0] = keep[-1] = True
+    return keep
+
+
+def clean_recording(times: np.ndarray, degrees: np.ndarray,
+                    sigma: float = DEFAULT_SMOOTH_SIGMA,
+                    idle_threshold: float = DEFAULT_IDLE_THRESHOLD,
+                    duplicate_tolerance: float = DEFAULT_DUPLICATE_TOLERANCE
+                    ) -> Tuple[np.ndarray, np.ndarray, CleanupReport]:
+    """Smooth, trim, dedupe and rebase one recording (times in seconds, degrees frames x joints)"""
+    times = np.asarray(times, dtype=np.float64)
+    degrees = np.asarray(degrees, dtype=np.float64)
+    report = CleanupReport(frames_in=len(degrees))
+    if len(degrees) == 0:
+        return times, degrees, report
+    report.duration_in = float(times[-1] - times[0])
+    first = first_motion(degrees, idle_threshold)
+    report.time_to_motion_in = float(times[first] - times[0]) if first is not None else 0.0
+
+    smoothed = smooth(degrees, sigma)
+    report.max_smoothing_error = float(np.abs(smoothed - degrees).max())
+
+    start, stop = trim_idle(smoothed, idle_threshold)
+    report.head_trimmed = start
+    report.tail_trimmed = len(degrees) - stop
+    times, smoothed = times[start:stop], smoothed[start:stop]
+
+    keep = duplicate_mask(smoothed, duplicate_tolerance)
+    report.duplicates_removed = int((~keep).sum())
+    times, smoothed = times[keep] - times[0], smoothed[keep]
+
+    report.frames_out = len(smoothed)
+    report.duration_out = float(times[-1])
+    first = first_motion(smoothed, idle_threshold)
+    report.time_to_motion_out = float(times[first]) if first is not None else 0.0
+    return times, smoothed, report
@@ -0,0 +1,169 @@
+"""
+Buffered background recorder for high-rate captures
+
+The capture loop only copies each sample into a preallocated ring buffer;
+a background thread drains it in batches and does all file I/O, so disk
+latency (an SD card flush can take tens of ms) never lands in the timed
+loop. When the writer cannot keep up and the buffer is full, new samples
+are dropped and counted rather than blocking the capture.
+
+Formats:
+    csv   timestamp plus one column per field, like lelamp/record.py always wrote
+    anim  float64 rows spooled to <path>.part while recording, converted to
+          the binary animation format (animation_file.py) on close
+"""
+import os
+import csv
+import threading
+import logging
+from dataclasses import dataclass, asdict
+from typing import Optional, Sequence
+
+import numpy as np
+
+from .animation_file import ANIMATION_EXTENSION, write_animation
+
+logger = logging.getLogger(__name__)
+
+SPOOL_SUFFIX = ".part"
+
+
+@dataclass
+class RecorderStats:
+    samples: int = 0            # accepted into the buffer
+    written: int = 0            # written to disk
+    dropped: int = 0            # buffer full
+    late: int = 0               # arrived more than 1.5 periods after the previous one
+    batches: int = 0
+    max_backlog: int = 0        # most samples waiting in the buffer at once
+    max_gap_ms: float = 0.0     # longest interval between samples
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+class BufferedRecorder:
+    """Ring buffer of (timestamp, values) drained to disk by a writer thread"""
+
+    def __init__(self, path: str, fields: Sequence[str], fmt: str = "csv", fps: float = 30,
+                 capacity: int = 8192, batch: int = 256, flush_interval: float = 0.5):
+        if fmt not in ("csv", "anim"):
+            raise ValueError(f"Unknown recording format: {fmt}")
+        self.path = path
+        self.fields = list(fields)
+        self.fmt = fmt
+        self.fps = fps
+        self.batch = batch
+        self.flush_interval = flush_interval
+        self.stats = RecorderStats()
+
+        self._buffer = np.empty((capacity, 1 + len(self.fields)), dtype=np.float64)
+        self._head = 0      # next slot to fill
+        self._count = 0     # filled slots not yet drained
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+        self._file = None
+        self._csv = None
+        self._last_timestamp: Optional[float] = None
+
+    @property
+    def spool_path(self) -> str:
+        return self.path + SPOOL_SUFFIX
+
+    def start(self):
+        if self.fmt == "csv":
+            self._file = open(self.path, 'w', newline='')
+            self._csv = csv.writer(self._file)
+            self._csv.writerow(['timestamp'] + self.fields)
+        else:
+            self._file = open(self.spool_path, 'wb')
+        self._running = True
+        self._thread = threading.Thread(target=self._writer_loop, daemon=True)
+        self._thread.start()
+
+    def push(self, timestamp: float, values: Sequence[float]) -> bool:
+        """Queue one sample; never blocks on I/O. False if it was dropped."""
+        stats = self.stats
+        if self._last_timestamp is not None and self.fps > 0:
+            gap = timestamp - self._last_timestamp
+            stats.max_gap_ms = max(stats.max_gap_ms, gap * 1e3)
+            if gap > 1.5 / self.fps:
+                stats.late += 1
+        self._last_timestamp = timestamp
+
+        with self._lock:
+            capacity = len(self._buffer)
+            if self._count == capacity:
+                stats.dropped += 1
+                return False
+            row = self._buffer[self._head]
+            row[0] = timestamp
+            row[1:] = values
+            self._head = (self._head + 1) % capacity
+            self._count += 1
+            stats.samples += 1
+            stats.max_backlog = max(stats.max_backlog, self._count)
+            full_batch = self._count >= self.batch
+        if full_batch:
+            self._wake.set()
+        return True
+
+    def _drain(self) -> np.ndarray:
+        with self._lock:
+            count = self._count
+            if count == 0:
+                return self._buffer[:0]
+            start = (self._head - count) % len(self._buffer)
+            rows = self._buffer[(start + np.arange(count)) % len(self._buffer)]
+            self._count = 0
+        return rows
+
+    def _write(self, rows: np.ndarray):
+        if len(rows) == 0:
+            return
+        if self._csv is not None:
+            self._csv.writerows(rows.tolist())
+        else:
+            self._file.write(rows.tobytes())
+        self._file.flush()
+        self.stats.written += len(rows)
+        self.stats.batches += 1
+
+    def _writer_loop(self):
+        while self._running:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self._write(self._drain())
+            except Exception as e:
+                logger.error(f"Recorder write failed: {e}")
+
+    def close(self) -> RecorderStats:
+        """Flush everything still buffered and finish the file"""
+        self._running = False
+        self._wake.set()
+        if self._thread:
+            self._thread.join()
+        self._write(self._drain())
+        self._file.close()
+        if self.fmt == "anim":
+            self._finish_animation()
+        return self.stats
+
+    def _finish_animation(self):
+        rows = np.fromfile(self.spool_path, dtype=np.float64).reshape(-1, 1 + len(self.fields))
+        timestamps = rows[:, 0]
+        dt = np.diff(timestamps)
+        dt = dt[dt > 0]
+        fps = float(1.0 / np.median(dt)) if len(dt) else float(self.fps)
+        joints = [field.removesuffix(".pos") for field in self.fields]
+        write_animation(self.path, joints, rows[:, 1:], fps, timestamps=timestamps)
+        os.remove(self.spool_path)
+
+
+def recording_path(recordings_dir: str, name: str, fmt: str) -> str:
+    extension = ANIMATION_EXTENSION if fmt == "anim" else ".csv"
+    return os.path.join(recordings_dir, f"{name}{extension}")
+
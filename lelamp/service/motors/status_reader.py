@@ -0,0 +1,131 @@
+"""
+Asynchronous status-reply reader for the servo bus
+
+A background thread owns the read side of the serial port. Incoming bytes
+are parsed incrementally into status packets; every packet updates the
+per-motor health state (error flags, reply counts), and replies that a
+request is waiting for (READ / SYNC_READ) are handed over to it.
+"""
+import time
+import threading
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Tuple
+
+from .telemetry import describe_error, parse_status_packets
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class MotorHealth:
+    error: int = 0                  # error bits of the last reply
+    replies: int = 0
+    error_replies: int = 0          # replies with any error bit set
+    last_reply: float = 0.0         # time.monotonic() of the last reply
+    seen_errors: List[str] = field(default_factory=list)  # every error flag seen so far
+
+    def as_dict(self) -> dict:
+        data = dict(self.__dict__)
+        data["errors"] = describe_error(self.error)
+        return data
+
+
+class StatusReader:
+    """Background parser of servo status packets"""
+
+    def __init__(self, motor_service):
+        self.motor_service = motor_service
+        self.running = False
+        self.thread = None
+        self.health: Dict[int, MotorHealth] = {}
+        self.bytes_read = 0
+        self.packets_parsed = 0
+
+        self._buf = bytearray()
+        self._cond = threading.Condition()
+        self._expected: set = set()
+        self._responses: Dict[int, Tuple[int, bytes]] = {}
+
+    def start(self):
+        if self.running:
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self._read_loop, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        if self.thread:
+            self.thread.join(timeout=1.0)
+
+    def expect(self, motor_ids: Iterable[int]):
+        """Start collecting replies from motor_ids. Call before sending the request."""
+        with self._cond:
+            self._expected = set(motor_ids)
+            self._responses = {}
+
+    def wait(self, timeout: float) -> Dict[int, Tuple[int, bytes]]:
+        """Wait for the replies registered with expect(). Returns {motor_id: (error, params)}."""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while not self._expected.issubset(self._responses):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            responses = self._responses
+            self._expected = set()
+            self._responses = {}
+            return responses
+
+    def get_health(self) -> Dict[int, MotorHealth]:
+        with self._cond:
+            return dict(self.health)
+
+    def _read_loop(self):
+        while self.running:
+            ser = self.motor_service.ser
+            if ser is None:
+                time.sleep(0.05)
+                continue
+            try:
+                # Blocks up to the port timeout for the first byte, then drains what's waiting
+                data = ser.read(max(1, ser.in_waiting))
+            except Exception as e:
+                if self.running:
+                    logger.error(f"Status reader failed: {e}")
+                time.sleep(0.05)
+                continue
+            if data:
+                self.feed(data)
+
+    def feed(self, data: bytes):
+        """Parse newly received bytes (also usable without the reader thread)"""
+        self.bytes_read += len(data)
+        self._buf += data
+        replies, consumed = parse_status_packets(self._buf)
+        del self._buf[:consumed]
+        if len(self._buf) > 1024:
+            # Never resynchronised - drop the garbage
+            self._buf.clear()
+        if not replies:
+            return
+
+        now = time.monotonic()
+        with self._cond:
+            for motor_id, error, params in replies:
+                self.packets_parsed += 1
+                health = self.health.setdefault(motor_id, MotorHealth())
+                health.error = error
+                health.replies += 1
+                health.last_reply = now
+                if error:
+                    health.error_replies += 1
+                    for name in describe_error(error):
+                        if name not in health.seen_errors:
+                            health.seen_errors.append(name)
+                            logger.warning(f"Motor {motor_id} reported {name} error")
+                if motor_id in self._expected:
+                    self._responses[motor_id] = (error, params)
+            self._cond.notify_all()
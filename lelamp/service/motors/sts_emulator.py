@@ -0,0 +1,517 @@
+"""
+Virtual Feetech STS3215 servo chain for hardware-free testing
+
+Emulates a chain of STS3215 servos at the packet level: WRITE, READ, PING,
+SYNC_WRITE and SYNC_READ are parsed and checksum-validated (a servo answers
+a corrupted packet addressed to it with the checksum error bit), status
+packets are returned according to each servo's status return level, and joints
+follow their goal with first-order, speed-limited dynamics. Transfer time
+on the wire is modelled from the baud rate.
+
+Two ways to use it:
+
+    # In-process, through pyserial's URL handlers
+    DirectMotorsService(port="sts3215://lamp")
+
+    # As a pseudo-terminal, for scripts that open a device path
+    python -m lelamp.service.motors.sts_emulator
+    -> prints e.g. /dev/pts/7, then DirectMotorsService(port="/dev/pts/7")
+
+Named in-process buses ("sts3215://<name>") are kept in EMULATED_BUSES so a
+test or benchmark can inspect the simulated servos while the service runs.
+"""
+import os
+import math
+import time
+import threading
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit, parse_qs
+
+logger = logging.getLogger(__name__)
+
+INST_PING = 0x01
+INST_READ = 0x02
+INST_WRITE = 0x03
+INST_SYNC_READ = 0x82
+INST_SYNC_WRITE = 0x83
+BROADCAST_ID = 0xFE
+
+ERROR_CHECKSUM = 0x10
+ERROR_INSTRUCTION = 0x40
+
+# Register map (subset of the STS3215 control table)
+ADDR_ID = 5
+ADDR_RETURN_DELAY = 7           # units of 2 us
+ADDR_STATUS_RETURN_LEVEL = 8
+ADDR_TORQUE_ENABLE = 40
+ADDR_ACCELERATION = 41          # units of 100 ticks/s^2, 0 = unlimited
+ADDR_GOAL_POSITION = 42
+ADDR_GOAL_SPEED = 46            # ticks/s, 0 = maximum
+ADDR_LOCK = 55
+ADDR_PRESENT_POSITION = 56
+ADDR_PRESENT_SPEED = 58
+ADDR_PRESENT_LOAD = 60
+ADDR_PRESENT_VOLTAGE = 62
+ADDR_PRESENT_TEMPERATURE = 63
+ADDR_MOVING = 66
+EEPROM_END = 40                 # addresses below this need Lock = 0 to be written
+
+MAX_SPEED = 3400.0              # ticks/s at 12 V (~0.22 s / 60 degrees)
+
+
+def checksum(body: Iterable[int]) -> int:
+    return (~sum(body)) & 0xFF
+
+
+def build_status(motor_id: int, error: int, params: bytes = b"") -> bytes:
+    body = bytes([motor_id, len(params) + 2, error]) + params
+    return b"\xff\xff" + body + bytes([checksum(body)])
+
+
+def encode_signed(value: int, sign_bit: int) -> int:
+    magnitude = min(abs(int(value)), (1 << sign_bit) - 1)
+    return magnitude | (1 << sign_bit) if value < 0 else magnitude
+
+
+class EmulatedServo:
+    """One STS3215: register memory plus first-order joint dynamics"""
+
+    def __init__(self, motor_id: int, position: int = 2048, tau: float = 0.05):
+        self.tau = tau
+        self.memory = bytearray(256)
+        self.memory[ADDR_ID] = motor_id
+        self.memory[ADDR_RETURN_DELAY] = 250        # factory default, 500 us
+        self.memory[ADDR_STATUS_RETURN_LEVEL] = 1   # factory default: reply to everything
+        self.memory[ADDR_LOCK] = 1
+        self.memory[ADDR_PRESENT_VOLTAGE] = 120
+        self.memory[ADDR_PRESENT_TEMPERATURE] = 30
+        self._set_word(ADDR_GOAL_POSITION, position)
+        self.position = float(position)
+        self.velocity = 0.0
+        self._t = time.monotonic()
+        self._update_present()
+
+    @property
+    def motor_id(self) -> int:
+        return self.memory[ADDR_ID]
+
+    @property
+    def status_return_level(self) -> int:
+        return self.memory[ADDR_STATUS_RETURN_LEVEL]
+
+    @property
+    def return_delay(self) -> float:
+        return self.memory[ADDR_RETURN_DELAY] * 2e-6
+
+    def _word(self, address: int) -> int:
+        return self.memory[address] | (self.memory[address + 1] << 8)
+
+    def _set_word(self, address: int, value: int):
+        self.memory[address] = value & 0xFF
+        self.memory[address + 1] = (value >> 8) & 0xFF
+
+    def write(self, address: int, data: bytes, now: float) -> int:
+        """Write registers, returns error bits"""
+        self.advance(now)
+        for i, value in enumerate(data):
+            addr = address + i
+            if addr < EEPROM_END and addr != ADDR_ID and self.memory[ADDR_LOCK]:
+                continue
+            if addr == ADDR_ID and self.memory[ADDR_LOCK]:
+                continue
+            if addr >= ADDR_PRESENT_POSITION and addr != ADDR_LOCK:
+                continue  # read-only status registers
+            self.memory[addr] = value
+        return 0
+
+    def read(self, address: int, length: int, now: float) -> bytes:
+        self.advance(now)
+        return bytes(self.memory[address:address + length])
+
+    def advance(self, now: float):
+        """Integrate joint dynamics up to `now`"""
+        dt = now - self._t
+        if dt <= 0:
+            return
+        self._t = now
+        if self.memory[ADDR_TORQUE_ENABLE]:
+            goal = float(self._word(ADDR_GOAL_POSITION))
+            max_speed = self._word(ADDR_GOAL_SPEED) or MAX_SPEED
+            max_speed = min(max_speed, MAX_SPEED)
+            accel = self.memory[ADDR_ACCELERATION] * 100.0
+            # First-order response toward the goal, with speed and acceleration limits
+            desired = (goal - self.position) / self.tau * (1.0 - math.exp(-dt / self.tau)) / dt
+            desired = max(-max_speed, min(max_speed, desired))
+            if accel > 0:
+                step = accel * dt
+                desired = max(self.velocity - step, min(self.velocity + step, desired))
+            self.velocity = desired
+            self.position += self.velocity * dt
+            self.position = max(0.0, min(4095.0, self.position))
+        else:
+            self.velocity = 0.0
+        self._update_present()
+
+    def _update_present(self):
+        goal = self._word(ADDR_GOAL_POSITION)
+        error = goal - self.position
+        load = max(-1000, min(1000, error * 2.0)) if self.memory[ADDR_TORQUE_ENABLE] else 0
+        self._set_word(ADDR_PRESENT_POSITION, int(round(self.position)))
+        self._set_word(ADDR_PRESENT_SPEED, encode_signed(self.velocity, 15))
+        self._set_word(ADDR_PRESENT_LOAD, encode_signed(load, 10))
+        self.memory[ADDR_PRESENT_TEMPERATURE] = 30 + min(40, int(abs(load) / 50))
+        self.memory[ADDR_MOVING] = 1 if abs(self.velocity) > 1.0 else 0
+
+
+class EmulatedBus:
+    """A chain of emulated servos sharing one half-duplex serial line"""
+
+    def __init__(self, motor_ids: Iterable[int] = (1, 2, 3, 4, 5), baudrate: int = 1000000,
+                 tau: float = 0.05, positions: Optional[Dict[int, int]] = None):
+        positions = positions or {}
+        self.baudrate = baudrate
+        self.servos: Dict[int, EmulatedServo] = {
+            i: EmulatedServo(i, positions.get(i, 2048), tau) for i in motor_ids
+        }
+        self.lock = threading.Lock()
+        self._rx = bytearray()
+        self.wire_free_at = 0.0
+        self.stats = {
+            "packets": 0, "bytes_in": 0, "bytes_out": 0,
+            "checksum_errors": 0, "busy_s": 0.0,
+        }
+
+    def byte_time(self, count: int) -> float:
+        """Seconds to transfer count bytes (8N1 = 10 bits per byte)"""
+        return count * 10.0 / self.baudrate
+
+    def receive(self, data: bytes, now: Optional[float] = None) -> List[Tuple[float, bytes]]:
+        """Feed host->servo bytes. Returns [(available_at, reply_bytes), ...]."""
+        now = time.monotonic() if now is None else now
+        with self.lock:
+            self.stats["bytes_in"] += len(data)
+            start = max(now, self.wire_free_at)
+            done = start + self.byte_time(len(data))
+            self.stats["busy_s"] += done - start
+            self.wire_free_at = done
+            self._rx += data
+
+            replies = []
+            for packet, valid in self._take_packets():
+                results = self._execute(packet, done) if valid else self._reject(packet)
+                for motor_id, status in results:
+                    servo = self.servos[motor_id]
+                    begin = max(done + servo.return_delay, self.wire_free_at)
+                    ready = begin + self.byte_time(len(status))
+                    self.stats["busy_s"] += ready - begin
+                    self.stats["bytes_out"] += len(status)
+                    self.wire_free_at = ready
+                    replies.append((ready, status))
+            return replies
+
+    def _take_packets(self) -> List[Tuple[bytes, bool]]:
+        """Complete packets in the receive buffer, with whether their checksum is valid"""
+        packets = []
+        buf = self._rx
+        i = 0
+        while i + 4 <= len(buf):
+            if buf[i] != 0xFF or buf[i + 1] != 0xFF or buf[i + 2] == 0xFF:
+                i += 1
+                continue
+            end = i + 4 + buf[i + 3]
+            if buf[i + 3] < 2:
+                i += 1
+                continue
+            if end > len(buf):
+                break
+            packet = bytes(buf[i:end])
+            if checksum(packet[2:-1]) != packet[-1]:
+                # Resynchronise on the next byte: the length may be the corrupted part
+                self.stats["checksum_errors"] += 1
+                packets.append((packet, False))
+                i += 1
+                continue
+            packets.append((packet, True))
+            i = end
+        del buf[:i]
+        return packets
+
+    def _reject(self, packet: bytes) -> List[Tuple[int, bytes]]:
+        """Status reply to a packet with a bad checksum: only the servo it names
+        answers (never on broadcast), as far as its status return level allows"""
+        motor_id, instruction = packet[2], packet[4]
+        servo = self.servos.get(motor_id)
+        if servo is None:
+            return []
+        if servo.status_return_level >= 1 or instruction in (INST_PING, INST_READ):
+            return [(motor_id, build_status(motor_id, ERROR_CHECKSUM))]
+        return []
+
+    def _execute(self, packet: bytes, now: float) -> List[Tuple[int, bytes]]:
+        """Run one instruction packet, returns status replies [(motor_id, bytes)]"""
+        self.stats["packets"] += 1
+        motor_id, instruction, params = packet[2], packet[4], packet[5:-1]
+        replies = []
+
+        if instruction == INST_SYNC_WRITE and motor_id == BROADCAST_ID and len(params) >= 2:
+            address, length = params[0], params[1]
+            for k in range(2, len(params) - length, length + 1):
+                servo = self.servos.get(params[k])
+                if servo is not None:
+                    servo.write(address, params[k + 1:k + 1 + length], now)
+            return replies
+
+        if instruction == INST_SYNC_READ and motor_id == BROADCAST_ID and len(params) >= 2:
+            address, length = params[0], params[1]
+            # Servos answer in the order they were asked
+            for target in params[2:]:
+                servo = self.servos.get(target)
+                if servo is not None:
+                    replies.append((target, build_status(target, 0, servo.read(address, length, now))))
+            return replies
+
+        servo = self.servos.get(motor_id)
+        if servo is None:
+            return replies  # unknown id or broadcast WRITE: nobody answers
+
+        if instruction == INST_PING:
+            replies.append((motor_id, build_status(motor_id, 0)))
+        elif instruction == INST_READ and len(params) >= 2:
+            replies.append((motor_id, build_status(motor_id, 0, servo.read(params[0], params[1], now))))
+        elif instruction == INST_WRITE and len(params) >= 1:
+            error = servo.write(params[0], params[1:], now)
+            if servo.status_return_level >= 1:
+                replies.append((servo.motor_id, build_status(servo.motor_id, error)))
+        else:
+            if servo.status_return_level >= 1:
+                replies.append((motor_id, build_status(motor_id, ERROR_INSTRUCTION)))
+        return replies
+
+
+# Named in-process buses, shared by every sts3215://<name> port opened on them
+EMULATED_BUSES: Dict[str, EmulatedBus] = {}
+
+
+def get_bus(name: str = "default", **kwargs) -> EmulatedBus:
+    if name not in EMULATED_BUSES:
+        EMULATED_BUSES[name] = EmulatedBus(**kwargs)
+    return EMULATED_BUSES[name]
+
+
+class ReplyBuffer:
+    """Bytes that become readable once their modelled transfer time has passed"""
+
+    def __init__(self):
+        self._pending: List[Tuple[float, bytes]] = []
+        self._ready = bytearray()
+        self._cond = threading.Condition()
+
+    def push(self, replies: List[Tuple[float, bytes]]):
+        if not replies:
+            return
+        with self._cond:
+            self._pending.extend(replies)
+            self._cond.notify_all()
+
+    def _promote(self, now: float):
+        while self._pending and self._pending[0][0] <= now:
+            self._ready += self._pending.pop(0)[1]
+
+    def available(self) -> int:
+        with self._cond:
+            self._promote(time.monotonic())
+            return len(self._ready)
+
+    def read(self, size: int, timeout: Optional[float]) -> bytes:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                self._promote(now)
+                if len(self._ready) >= size:
+                    break
+                waits = []
+                if self._pending:
+                    waits.append(self._pending[0][0] - now)
+                if deadline is not None:
+                    if now >= deadline:
+                        break
+                    waits.append(deadline - now)
+                self._cond.wait(min(waits) if waits else None)
+            data = bytes(self._ready[:size])
+            del self._ready[:size]
+            return data
+
+    def clear(self):
+        with self._cond:
+            self._pending.clear()
+            self._ready.clear()
+
+    def wake(self):
+        with self._cond:
+            self._cond.notify_all()
+
+
+try:
+    from serial.serialutil import SerialBase, SerialException, PortNotOpenError
+except ImportError:  # pyserial missing: only the pty emulator is usable
+    SerialBase = object
+
+
+class EmulatedSerial(SerialBase):
+    """pyserial port backed by a named EmulatedBus (sts3215://<name>?ids=1,2,3)"""
+
+    def open(self):
+        if self._port is None:
+            raise SerialException("Port must be configured before it can be used.")
+        if self.is_open:
+            raise SerialException("Port is already open.")
+        name, options = parse_url(self.portstr)
+        self.emulated_bus = get_bus(name, baudrate=self._baudrate, **options)
+        self._replies = ReplyBuffer()
+        self.is_open = True
+        self._reconfigure_port()
+
+    def close(self):
+        if self.is_open:
+            self.is_open = False
+            self._replies.wake()
+
+    def _reconfigure_port(self):
+        if self.is_open:
+            self.emulated_bus.baudrate = self._baudrate
+
+    def from_url(self, url):
+        parse_url(url)
+        return url
+
+    @property
+    def in_waiting(self):
+        if not self.is_open:
+            raise PortNotOpenError()
+        return self._replies.available()
+
+    def read(self, size=1):
+        if not self.is_open:
+            raise PortNotOpenError()
+        return self._replies.read(size, self._timeout)
+
+    def write(self, data):
+        if not self.is_open:
+            raise PortNotOpenError()
+        data = bytes(data)
+        self._replies.push(self.emulated_bus.receive(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def reset_input_buffer(self):
+        if not self.is_open:
+            raise PortNotOpenError()
+        self._replies.clear()
+
+    def reset_output_buffer(self):
+        if not self.is_open:
+            raise PortNotOpenError()
+
+
+class PtyEmulator:
+    """Serves an EmulatedBus on a pseudo-terminal so any program can open it by path"""
+
+    def __init__(self, bus: Optional[EmulatedBus] = None):
+        self.bus = bus or EmulatedBus()
+        self.master_fd = None
+        self.slave_fd = None
+        self.path = None
+        self.running = False
+        self._replies = ReplyBuffer()
+        self._threads: List[threading.Thread] = []
+
+    def start(self) -> str:
+        import tty
+        self.master_fd, self.slave_fd = os.openpty()
+        tty.setraw(self.slave_fd)
+        self.path = os.ttyname(self.slave_fd)
+        self.running = True
+        for target in (self._rx_loop, self._tx_loop):
+            thread = threading.Thread(target=target, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        logger.info(f"STS3215 emulator listening on {self.path}")
+        return self.path
+
+    def stop(self):
+        self.running = False
+        self._replies.wake()
+        for fd in (self.master_fd, self.slave_fd):
+            if fd is not None:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+        self.master_fd = self.slave_fd = None
+
+    def _rx_loop(self):
+        while self.running:
+            try:
+                data = os.read(self.master_fd, 4096)
+            except OSError:
+                break
+            if data:
+                self._replies.push(self.bus.receive(data))
+
+    def _tx_loop(self):
+        while self.running:
+            data = self._replies.read(1, timeout=0.1)
+            if not data:
+                continue
+            data += self._replies.read(self._replies.available(), timeout=0)
+            try:
+                os.write(self.master_fd, data)
+            except OSError:
+                break
+
+
+def parse_url(url: str) -> Tuple[str, dict]:
+    """sts3215://<name>?ids=1,2,3&tau=0.05 -> (name, EmulatedBus kwargs)"""
+    parts = urlsplit(url)
+    if parts.scheme != "sts3215":
+        raise ValueError(f"expected sts3215://[name][?ids=1,2,3&tau=0.05], got {url!r}")
+    options = {}
+    for key, values in parse_qs(parts.query).items():
+        if key == "ids":
+            options["motor_ids"] = [int(v) for v in values[0].split(",")]
+        elif key == "tau":
+            options["tau"] = float(values[0])
+        else:
+            raise ValueError(f"unknown sts3215:// option: {key}")
+    return parts.netloc or "default", options
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Emulate a chain of STS3215 servos on a pseudo-terminal")
+    parser.add_argument('--ids', type=str, default="1,2,3,4,5", help='Servo ids on the chain (default: 1,2,3,4,5)')
+    parser.add_argument('--baudrate', type=int, default=1000000, help='Modelled baud rate (default: 1000000)')
+    parser.add_argument('--tau', type=float, default=0.05, help='Joint time constant in seconds (default: 0.05)')
+    args = parser.parse_args()
+
+    bus = EmulatedBus([int(i) for i in args.ids.split(",")], baudrate=args.baudrate, tau=args.tau)
+    emulator = PtyEmulator(bus)
+    path = emulator.start()
+    print(f"STS3215 emulator running on {path} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(2)
+            positions = {i: s.read(ADDR_PRESENT_POSITION, 2, time.monotonic()) for i, s in bus.servos.items()}
+            print("  " + "  ".join(f"{i}:{p[0] | (p[1] << 8)}" for i, p in positions.items()))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        emulator.stop()
+
+
+if __name__ == "__main__":
+    main()
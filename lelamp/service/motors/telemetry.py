@@ -0,0 +1,227 @@
+"""
+Bulk servo telemetry for DirectMotorsService
+
+Reads present position, speed, load, voltage and temperature of every joint
+with one Feetech SYNC_READ transaction (registers 56-63) at a fixed rate.
+Each result is published as an immutable snapshot; readers just grab the
+latest reference, so no lock is needed on the read side.
+"""
+import time
+import threading
+import logging
+from dataclasses import dataclass, asdict
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+INST_SYNC_READ = 0x82
+
+# STS3215 status registers read in one block
+ADDR_TELEMETRY = 56   # Present_Position (2), Present_Speed (2), Present_Load (2), Present_Voltage (1), Present_Temperature (1)
+TELEMETRY_LEN = 8
+
+# Status packet error bits
+ERROR_FLAGS = {
+    0x01: "voltage",
+    0x02: "angle",
+    0x04: "overheat",
+    0x08: "range",
+    0x10: "checksum",
+    0x20: "overload",
+    0x40: "instruction",
+}
+
+
+def decode_signed(value: int, sign_bit: int) -> int:
+    """Feetech sign-magnitude encoding: bit `sign_bit` set means negative"""
+    magnitude = value & ((1 << sign_bit) - 1)
+    return -magnitude if value & (1 << sign_bit) else magnitude
+
+
+def describe_error(error: int) -> list:
+    return [name for bit, name in ERROR_FLAGS.items() if error & bit]
+
+
+def parse_status_packets(buf: bytes) -> Tuple[List[Tuple[int, int, bytes]], int]:
+    """Parse every complete, valid status packet in buf.
+
+    Returns ([(motor_id, error, params), ...], bytes_consumed). Garbage and packets
+    with a bad checksum are skipped; a trailing partial packet is left unconsumed.
+    """
+    replies = []
+    i = 0
+    n = len(buf)
+    while i + 4 <= n:
+        if buf[i] != 0xFF or buf[i + 1] != 0xFF or buf[i + 2] == 0xFF:
+            i += 1
+            continue
+        motor_id, length = buf[i + 2], buf[i + 3]
+        end = i + 4 + length
+        if length < 2:
+            i += 1
+            continue
+        if end > n:
+            break
+        body = buf[i + 2:end - 1]
+        if (~sum(body)) & 0xFF != buf[end - 1]:
+            i += 1
+            continue
+        replies.append((motor_id, buf[i + 4], bytes(buf[i + 5:end - 1])))
+        i = end
+    return replies, i
+
+
+@dataclass(frozen=True)
+class JointTelemetry:
+    position: int       # ticks 0-4095
+    speed: int          # ticks/s, signed
+    load: float         # percent of max torque, signed
+    voltage: float      # volts
+    temperature: int    # degrees C
+    error: int          # status error bits
+
+    def as_dict(self) -> dict:
+        data = asdict(self)
+        data["errors"] = describe_error(self.error)
+        return data
+
+
+@dataclass(frozen=True)
+class TelemetrySnapshot:
+    timestamp: float                    # time.time() when the read completed
+    monotonic: float                    # time.monotonic() at the middle of the transaction
+    read_ms: float                      # duration of the bus transaction
+    joints: Dict[str, JointTelemetry]   # joints that answered, by name
+
+    def as_dict(self) -> dict:
+        return {
+            "timestamp": self.timestamp,
+            "read_ms": self.read_ms,
+            "joints": {name: joint.as_dict() for name, joint in self.joints.items()},
+        }
+
+
+def decode_telemetry(error: int, params: bytes) -> Optional[JointTelemetry]:
+    if len(params) < TELEMETRY_LEN:
+        return None
+    return JointTelemetry(
+        position=params[0] | (params[1] << 8),
+        speed=decode_signed(params[2] | (params[3] << 8), 15),
+        load=decode_signed(params[4] | (params[5] << 8), 10) / 10.0,
+        voltage=params[6] / 10.0,
+        temperature=params[7],
+        error=error,
+    )
+
+
+class TelemetryReader:
+    """Background SYNC_READ poller publishing the latest TelemetrySnapshot"""
+
+    def __init__(self, motor_service, rate: float = 10.0, reply_timeout: float = 0.01):
+        self.motor_service = motor_service
+        self.rate = rate
+        self.reply_timeout = reply_timeout
+        self.running = False
+        self.thread = None
+        self._snapshot: Optional[TelemetrySnapshot] = None
+        self._listeners: List[Callable[[TelemetrySnapshot], None]] = []
+        self.reads = 0
+        self.missed_replies = 0
+
+    def start(self):
+        if self.running or self.rate <= 0:
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self._poll_loop, daemon=True)
+        self.thread.start()
+        logger.info(f"Telemetry reader started at {self.rate} Hz")
+
+    def stop(self):
+        self.running = False
+        if self.thread:
+            self.thread.join(timeout=1.0)
+
+    def subscribe(self, callback: Callable[[TelemetrySnapshot], None]):
+        """Call callback(snapshot) from the poller thread after every read"""
+        self._listeners = self._listeners + [callback]
+
+    def unsubscribe(self, callback: Callable[[TelemetrySnapshot], None]):
+        self._listeners = [cb for cb in self._listeners if cb is not callback]
+
+    def latest(self) -> Optional[TelemetrySnapshot]:
+        """Most recent snapshot (None until the first successful read)"""
+        return self._snapshot
+
+    def read_now(self) -> Optional[TelemetrySnapshot]:
+        """Run one SYNC_READ transaction, publish and return its snapshot"""
+        service = self.motor_service
+        ids = service.MOTOR_IDS
+        names = dict(zip(ids, service.MOTOR_NAMES))
+        packet = service._build_packet(service.BROADCAST_ID, INST_SYNC_READ,
+                                       bytes([ADDR_TELEMETRY, TELEMETRY_LEN] + ids))
+        expected = len(ids) * (TELEMETRY_LEN + 6)
+
+        # Hold the bus only for the transaction itself so the writer is never
+        # delayed by more than one read round trip
+        t0 = time.perf_counter()
+        with service.bus.lock:
+            ser = service.ser
+            if ser is None:
+                return None
+            status_reader = service.status_reader
+            if status_reader.running:
+                # The status reader thread owns the read side; it hands our replies back
+                status_reader.expect(ids)
+                ser.write(packet)
+                replies = status_reader.wait(self.reply_timeout)
+            else:
+                ser.reset_input_buffer()
+                ser.write(packet)
+                parsed, _ = parse_status_packets(self._read_replies(ser, expected))
+                replies = {motor_id: (error, params) for motor_id, error, params in parsed}
+        t1 = time.perf_counter()
+        read_ms = (t1 - t0) * 1000
+        mid = time.monotonic() - (t1 - t0) / 2
+
+        joints = {}
+        for motor_id, (error, params) in replies.items():
+            joint = decode_telemetry(error, params)
+            if motor_id in names and joint is not None:
+                joints[names[motor_id]] = joint
+        self.reads += 1
+        self.missed_replies += len(ids) - len(joints)
+
+        snapshot = TelemetrySnapshot(timestamp=time.time(), monotonic=mid, read_ms=read_ms, joints=joints)
+        self._snapshot = snapshot  # single reference swap, safe for lock-free readers
+        for callback in self._listeners:
+            try:
+                callback(snapshot)
+            except Exception as e:
+                logger.error(f"Telemetry listener failed: {e}")
+        return snapshot
+
+    def _read_replies(self, ser, expected: int) -> bytes:
+        buf = bytearray()
+        deadline = time.perf_counter() + self.reply_timeout
+        while len(buf) < expected and time.perf_counter() < deadline:
+            waiting = ser.in_waiting
+            if waiting:
+                buf += ser.read(waiting)
+            else:
+                time.sleep(0.0002)
+        return bytes(buf)
+
+    def _poll_loop(self):
+        next_read = time.monotonic()
+        while self.running:
+            try:
+                self.read_now()
+            except Exception as e:
+                logger.error(f"Telemetry read failed: {e}")
+            # rate may be raised temporarily (e.g. while measuring playback)
+            next_read += 1.0 / self.rate
+            delay = next_read - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_read = time.monotonic()
@@ -0,0 +1,114 @@
+"""
+Commanded-vs-actual tracking metrics for animation playback
+
+While an animation plays, every commanded goal frame and every measured
+present-position sample from telemetry is recorded. Afterwards the two are
+compared per joint to show how well the servos follow the recording.
+"""
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+import numpy as np
+
+DEGREES_PER_TICK = 180.0 / 2048
+MAX_LAG = 0.5       # seconds searched when estimating latency
+LAG_STEP = 0.005
+
+
+@dataclass
+class JointTrackingStats:
+    rms_error_deg: float = 0.0      # measured vs commanded (zero-order hold)
+    max_error_deg: float = 0.0
+    latency_ms: float = 0.0         # delay that best aligns measured with commanded
+    overshoot_deg: float = 0.0      # how far measured left the commanded range
+
+
+@dataclass
+class TrackingSummary:
+    name: str
+    commanded_frames: int = 0
+    measured_samples: int = 0
+    joints: Dict[str, JointTrackingStats] = field(default_factory=dict)
+
+    def as_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "commanded_frames": self.commanded_frames,
+            "measured_samples": self.measured_samples,
+            "joints": {name: dict(stats.__dict__) for name, stats in self.joints.items()},
+        }
+
+
+def _hold(times: np.ndarray, values: np.ndarray, query: np.ndarray) -> np.ndarray:
+    """Zero-order hold: the last value commanded at or before each query time"""
+    idx = np.clip(np.searchsorted(times, query, side='right') - 1, 0, len(times) - 1)
+    return values[idx]
+
+
+def _estimate_lag(cmd_t: np.ndarray, cmd: np.ndarray, meas_t: np.ndarray, meas: np.ndarray) -> float:
+    """Shift (s) of the commanded signal that minimizes RMS error to the measured one"""
+    if np.ptp(cmd) == 0:
+        return 0.0
+    best_lag, best_err = 0.0, np.inf
+    for lag in np.arange(0.0, MAX_LAG + LAG_STEP, LAG_STEP):
+        shifted = np.interp(meas_t - lag, cmd_t, cmd)
+        err = np.mean((meas - shifted) ** 2)
+        if err < best_err:
+            best_lag, best_err = lag, err
+    return float(best_lag)
+
+
+class TrackingRecorder:
+    """Collects commanded and measured joint positions during one playback"""
+
+    def __init__(self, name: str, motor_ids: List[int], motor_names: List[str]):
+        self.name = name
+        self.motor_ids = list(motor_ids)
+        self.motor_names = list(motor_names)
+        self._lock = threading.Lock()
+        self._cmd_t: List[float] = []
+        self._cmd: List[List[float]] = []
+        self._meas_t: List[float] = []
+        self._meas: List[List[float]] = []
+
+    def command(self, t: float, pose: List[int]):
+        """Record a commanded goal frame (ticks, ordered like motor_ids)"""
+        with self._lock:
+            self._cmd_t.append(t)
+            self._cmd.append(pose)
+
+    def measure(self, t: float, positions: Dict[str, int]):
+        """Record measured present positions by joint name"""
+        if not all(name in positions for name in self.motor_names):
+            return
+        with self._lock:
+            self._meas_t.append(t)
+            self._meas.append([positions[name] for name in self.motor_names])
+
+    def summarize(self) -> TrackingSummary:
+        with self._lock:
+            cmd_t = np.array(self._cmd_t, dtype=np.float64)
+            cmd = np.array(self._cmd, dtype=np.float64).reshape(-1, len(self.motor_ids))
+            meas_t = np.array(self._meas_t, dtype=np.float64)
+            meas = np.array(self._meas, dtype=np.float64).reshape(-1, len(self.motor_names))
+
+        summary = TrackingSummary(self.name, commanded_frames=len(cmd_t), measured_samples=len(meas_t))
+        # Only samples taken after the first command can be compared
+        valid = meas_t >= cmd_t[0] if len(cmd_t) else np.zeros(len(meas_t), dtype=bool)
+        meas_t, meas = meas_t[valid], meas[valid]
+        if len(cmd_t) == 0 or len(meas_t) == 0:
+            return summary
+
+        held = _hold(cmd_t, cmd, meas_t)
+        error = (meas - held) * DEGREES_PER_TICK
+        for j, name in enumerate(self.motor_names):
+            above = meas[:, j] - cmd[:, j].max()
+            below = cmd[:, j].min() - meas[:, j]
+            summary.joints[name] = JointTrackingStats(
+                rms_error_deg=float(np.sqrt(np.mean(error[:, j] ** 2))),
+                max_error_deg=float(np.abs(error[:, j]).max()),
+                latency_ms=_estimate_lag(cmd_t, cmd[:, j], meas_t, meas[:, j]) * 1000,
+                overshoot_deg=float(max(above.max(), below.max(), 0.0)) * DEGREES_PER_TICK,
+            )
+        return summary
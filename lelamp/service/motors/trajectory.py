@@ -0,0 +1,45 @@
+"""
+Trajectory helpers for DirectMotorsService
+Min-jerk blends between poses and crossfades between animations, so moves
+start and stop smoothly instead of snapping to the next goal.
+"""
+from typing import Tuple
+
+import numpy as np
+
+
+def min_jerk(s: np.ndarray) -> np.ndarray:
+    """Min-jerk easing 10s^3 - 15s^4 + 6s^5, maps [0, 1] -> [0, 1] with zero end velocity/acceleration"""
+    s = np.clip(s, 0.0, 1.0)
+    return s * s * s * (10.0 + s * (-15.0 + 6.0 * s))
+
+
+def blend_poses(start: np.ndarray, end: np.ndarray, duration: float, fps: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Min-jerk trajectory from start to end pose.
+
+    Returns (times, frames) sampled at fps; the first frame is one step
+    after start and the last frame is exactly end.
+    """
+    start = np.asarray(start, dtype=np.float64)
+    end = np.asarray(end, dtype=np.float64)
+    steps = max(int(round(duration * fps)), 1)
+    times = np.arange(1, steps + 1, dtype=np.float64) / fps
+    weights = min_jerk(times / times[-1])
+    frames = start + (end - start) * weights[:, None]
+    return times, np.rint(frames).astype(np.int32)
+
+
+def crossfade(tail: np.ndarray, head: np.ndarray) -> np.ndarray:
+    """Blend the tail of one animation into the head of the next.
+
+    The first len(tail) frames of head are mixed with tail using min-jerk
+    weights going from all-tail to all-head. Returns a new array.
+    """
+    frames = np.array(head, dtype=np.int32, copy=True)
+    k = min(len(tail), len(head))
+    if k == 0:
+        return frames
+    weights = min_jerk(np.arange(1, k + 1, dtype=np.float64) / (k + 1))[:, None]
+    mixed = tail[-k:].astype(np.float64) * (1.0 - weights) + head[:k] * weights
+    frames[:k] = np.rint(mixed).astype(np.int32)
+    return frames
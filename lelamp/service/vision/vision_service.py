@@ -58,6 +58,7 @@ class VisionService:
         self.running = False
         if self.thread: self.thread.join(timeout=1.0)
         if self.motor_service:
+            self.motor_service.release_joints("tracking")
             self.motor_service._is_animating = False
         logger.info("Vision Service stopped")
         
@@ -154,7 +155,6 @@ class VisionService:
         # Base Yaw
         yaw_offset = self.motor_service.offsets.get('base_yaw', 2048)
         yaw_pos = int(yaw_offset + (yaw_deg / 180.0) * 2048)
-        self.motor_service._set_position(1, yaw_pos)
         
         # Pitch Logic (Inverse Kinematics approx)
         k_base = -0.5
@@ -163,12 +163,13 @@ class VisionService:
         
         bp_offset = self.motor_service.offsets.get('base_pitch', 2048)
         bp_pos = int(bp_offset + (pitch_deg * k_base / 180.0) * 2048)
-        self.motor_service._set_position(2, bp_pos)
         
         ep_offset = self.motor_service.offsets.get('elbow_pitch', 2048)
         ep_pos = int(ep_offset + (pitch_deg * k_elbow / 180.0) * 2048)
-        self.motor_service._set_position(3, ep_pos)
         
         wp_offset = self.motor_service.offsets.get('wrist_pitch', 2048)
         wp_pos = int(wp_offset + (pitch_deg * k_wrist / 180.0) * 2048)
-        self.motor_service._set_position(5, wp_pos)
+        
+        # Claim the tracked joints; the motor service's bus writer sends them
+        # as one sync-write frame, arbitrated against idle and animations
+        self.motor_service.claim_joints("tracking", {1: yaw_pos, 2: bp_pos, 3: ep_pos, 5: wp_pos})
@@ -0,0 +1,187 @@
+import argparse
+import os
+import threading
+import time
+from typing import Optional
+
+import numpy as np
+
+from .follower import LeLampFollowerConfig, LeLampFollower
+from .leader import LeLampLeaderConfig, LeLampLeader
+from .record import print_recorder_stats
+from .service.motors.sample_recorder import BufferedRecorder, recording_path
+from lerobot.utils.robot_utils import busy_wait
+
+
+def percentiles(values, scale=1.0):
+    """p50/p95/p99/max of values (times scale), or None without samples"""
+    if not values:
+        return None
+    p50, p95, p99 = np.percentile(values, [50, 95, 99]) * scale
+    return {"p50": float(p50), "p95": float(p95), "p99": float(p99), "max": float(np.max(values) * scale)}
+
+
+class TeleopMirror:
+    """Mirror the leader arm onto the follower in real time
+
+    The leader is sync-read on one thread and the follower sync-written on
+    another, so reading the next frame overlaps with writing the last one.
+    Only the newest leader frame is ever written: if the follower falls
+    behind, older frames are dropped instead of queueing up latency.
+    """
+
+    def __init__(self, leader, follower, fps: int = 60, recorder: Optional[BufferedRecorder] = None):
+        self.leader = leader
+        self.follower = follower
+        self.fps = fps
+        self.recorder = recorder
+        self.running = False
+        self._cond = threading.Condition()
+        self._latest = None     # (read_start, read_done, action) not yet written
+        self._threads = []
+
+        self.read_ms: list = []             # leader sync-read duration
+        self.write_ms: list = []            # follower sync-write duration
+        self.latency_ms: list = []          # leader read start -> follower write done
+        self.read_intervals: list = []      # seconds between leader reads
+        self.write_intervals: list = []     # seconds between follower writes
+        self.frames_read = 0
+        self.frames_written = 0
+        self.frames_dropped = 0             # read but superseded before they were written
+
+    def start(self):
+        self.running = True
+        self._threads = [
+            threading.Thread(target=self._read_loop, daemon=True),
+            threading.Thread(target=self._write_loop, daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self):
+        with self._cond:
+            self.running = False
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join(timeout=1.0)
+
+    def _read_loop(self):
+        last = None
+        while self.running:
+            t0 = time.perf_counter()
+            action = self.leader.get_action()
+            t1 = time.perf_counter()
+            with self._cond:
+                if self._latest is not None:
+                    self.frames_dropped += 1
+                self._latest = (t0, t1, action)
+                self._cond.notify()
+            self.frames_read += 1
+            self.read_ms.append((t1 - t0) * 1e3)
+            if last is not None:
+                self.read_intervals.append(t0 - last)
+            last = t0
+            if self.recorder is not None:
+                self.recorder.push(t0, [action[key] for key in self.recorder.fields])
+            busy_wait(1.0 / self.fps - (time.perf_counter() - t0))
+
+    def _write_loop(self):
+        last = None
+        while True:
+            with self._cond:
+                while self.running and self._latest is None:
+                    self._cond.wait()
+                if not self.running:
+                    return
+                read_start, _, action = self._latest
+                self._latest = None
+            t0 = time.perf_counter()
+            self.follower.send_action(action)
+            t1 = time.perf_counter()
+            self.frames_written += 1
+            self.write_ms.append((t1 - t0) * 1e3)
+            self.latency_ms.append((t1 - read_start) * 1e3)
+            if last is not None:
+                self.write_intervals.append(t1 - last)
+            last = t1
+
+    def get_stats(self) -> dict:
+        read_rate = percentiles([1.0 / dt for dt in self.read_intervals if dt > 0])
+        write_rate = percentiles([1.0 / dt for dt in self.write_intervals if dt > 0])
+        return {
+            "frames_read": self.frames_read,
+            "frames_written": self.frames_written,
+            "frames_dropped": self.frames_dropped,
+            "latency_ms": percentiles(self.latency_ms),
+            "read_ms": percentiles(self.read_ms),
+            "write_ms": percentiles(self.write_ms),
+            "read_hz": read_rate,
+            "write_hz": write_rate,
+        }
+
+
+def print_stats(stats: dict):
+    print(f"Frames: {stats['frames_read']} read, {stats['frames_written']} written, "
+          f"{stats['frames_dropped']} dropped")
+    for key, label, unit in (
+        ("latency_ms", "End-to-end latency", "ms"),
+        ("read_ms", "Leader read", "ms"),
+        ("write_ms", "Follower write", "ms"),
+        ("read_hz", "Leader loop rate", "Hz"),
+        ("write_hz", "Follower loop rate", "Hz"),
+    ):
+        p = stats[key]
+        if p:
+            print(f"  {label}: p50 {p['p50']:.1f}{unit}  p95 {p['p95']:.1f}{unit}  "
+                  f"p99 {p['p99']:.1f}{unit}  max {p['max']:.1f}{unit}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mirror the leader arm onto the lamp in real time")
+    parser.add_argument('--leader-port', type=str, required=True, help='Serial port of the leader arm')
+    parser.add_argument('--leader-id', type=str, required=True, help='ID of the leader arm')
+    parser.add_argument('--port', type=str, required=True, help='Serial port for the lamp')
+    parser.add_argument('--id', type=str, required=True, help='ID of the lamp')
+    parser.add_argument('--fps', type=int, default=60, help='Leader read rate (default: 60)')
+    parser.add_argument('--seconds', type=float, help='Stop after this many seconds (default: until Ctrl+C)')
+    parser.add_argument('--record', type=str, help='Also save the mirrored motion as a recording with this name')
+    parser.add_argument('--format', choices=['csv', 'anim'], default='csv', help='Recording format (default: csv)')
+    args = parser.parse_args()
+
+    leader = LeLampLeader(LeLampLeaderConfig(port=args.leader_port, id=args.leader_id))
+    leader.connect(calibrate=False)
+    follower = LeLampFollower(LeLampFollowerConfig(port=args.port, id=args.id))
+    follower.connect(calibrate=False)
+
+    recorder = None
+    if args.record:
+        recordings_dir = os.path.join(os.path.dirname(__file__), "recordings")
+        os.makedirs(recordings_dir, exist_ok=True)
+        path = recording_path(recordings_dir, args.record, args.format)
+        recorder = BufferedRecorder(path, list(leader.action_features), fmt=args.format, fps=args.fps)
+        recorder.start()
+
+    mirror = TeleopMirror(leader, follower, fps=args.fps, recorder=recorder)
+    input("Press Enter to start mirroring...")
+    mirror.start()
+    print("🪞 Mirroring leader onto the lamp, Ctrl+C to stop")
+    try:
+        deadline = time.monotonic() + args.seconds if args.seconds else None
+        while deadline is None or time.monotonic() < deadline:
+            time.sleep(0.1)
+    except KeyboardInterrupt:
+        pass
+    print("Shutting down teleop...")
+    mirror.stop()
+
+    print_stats(mirror.get_stats())
+    if recorder is not None:
+        print_recorder_stats(recorder.close(), args.fps)
+        print(f"Saved {recorder.path}")
+
+    follower.disconnect()
+    leader.disconnect()
+
+
+if __name__ == "__main__":
+    main()
@@ -489,6 +489,14 @@ NEVER respond without calling play_animation first!"""
                     "required": ["animation"]
                 }
             },
+            {
+                "name": "get_motor_status",
+                "description": "Check the health of the lamp's motors: temperature, voltage, load and errors. Use when the user asks how the lamp's body/motors are doing.",
+                "parameters": {
+                    "type": "object",
+                    "properties": {}
+                }
+            },
             {
                 "name": "get_current_time",
                 "description": "Get the current date and time. Call this when user asks 'what time is it', 'what's the date', etc.",
@@ -756,12 +764,8 @@ NEVER respond without calling play_animation first!"""
         if animation_lower not in valid_animations:
             return f"Unknown animation: {animation}. Available: {', '.join(valid_animations)}"
         
-        # Skip animations when hand tracking is active (motors controlled by vision)
-        if self.vision_service and self.vision_service.running:
-            print(f"🎭 Animation skipped (hand tracking active): {animation_lower}")
-            return f"Animation {animation_lower} skipped (hand tracking active)"
-        
         if self.motors_service:
+            # While hand tracking is active the animation is layered on top of it as a gesture
             self.motors_service.dispatch("play", animation_lower)
             print(f"🎭 Playing animation: {animation_lower}")
             return f"Playing animation: {animation_lower}"
@@ -769,6 +773,24 @@ NEVER respond without calling play_animation first!"""
             print(f"🎭 Animation would play: {animation_lower} (no motors)")
             return f"Animation {animation_lower} (motors not connected)"
     
+    def _execute_get_motor_status(self) -> str:
+        """Report latest motor telemetry"""
+        if not self.motors_service:
+            return "Motors not connected."
+        
+        telemetry = self.motors_service.get_telemetry()
+        if not telemetry or not telemetry["joints"]:
+            return "No motor telemetry available yet."
+        
+        parts = []
+        for name, joint in telemetry["joints"].items():
+            status = f"{name}: {joint['temperature']}°C, {joint['voltage']:.1f}V, load {joint['load']:.0f}%"
+            if joint["errors"]:
+                status += f" (errors: {', '.join(joint['errors'])})"
+            parts.append(status)
+        print(f"🔩 Motor status: {'; '.join(parts)}")
+        return "; ".join(parts)
+    
     def _execute_start_tracking(self) -> str:
         """Enable hand tracking"""
         if self.vision_service:
@@ -845,6 +867,8 @@ NEVER respond without calling play_animation first!"""
                 result = self._execute_start_tracking()
             elif func_name == "stop_hand_tracking":
                 result = self._execute_stop_tracking()
+            elif func_name == "get_motor_status":
+                result = self._execute_get_motor_status()
 
             elif func_name == "get_current_time":
                 result = self._execute_get_time()
@@ -1073,6 +1097,10 @@ NEVER respond without calling play_animation first!"""
             pass
         finally:
             print("\n👋 Goodbye!")
+            if self.vision_service:
+                self.vision_service.stop()
+            if self.motors_service:
+                self.motors_service.stop()
             if self.rgb_service:
                 self.rgb_service.stop()
 
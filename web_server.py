@@ -11,7 +11,7 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Request
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from dotenv import load_dotenv
 import uuid
 
@@ -139,6 +139,8 @@ class RGBPattern(BaseModel):
 
 class RecordingAction(BaseModel):
     name: str
+    rate: float = Field(1.0, gt=0)
+    duration: Optional[float] = Field(None, gt=0)
 
 class ConversationMessage(BaseModel):
     user_input: str
@@ -249,27 +251,61 @@ async def rgb_off():
     return {"status": "ok"}
 
 # Recording Endpoints
-@app.get("/api/recordings")
-async def list_recordings():
+_recording_catalog = None
+
+def get_recording_catalog():
+    """The motor service's catalog, or a standalone one when motors are unavailable"""
+    global _recording_catalog
     if state.motors_service:
-        recordings = state.motors_service.get_available_recordings()
-    else:
+        return state.motors_service.catalog
+    if _recording_catalog is None:
+        from lelamp.service.motors.direct_motors_service import MOTOR_NAMES
+        from lelamp.service.motors.recording_catalog import RecordingCatalog
         recordings_dir = os.path.join(os.path.dirname(__file__), "lelamp", "recordings")
-        recordings = []
-        if os.path.exists(recordings_dir):
-            for f in os.listdir(recordings_dir):
-                if f.endswith(".csv"):
-                    recordings.append(f[:-4])
-    return {"recordings": sorted(recordings)}
+        _recording_catalog = RecordingCatalog(recordings_dir, MOTOR_NAMES)
+        _recording_catalog.refresh()
+        _recording_catalog.watch()
+    return _recording_catalog
+
+@app.get("/api/recordings")
+async def list_recordings():
+    return {"recordings": get_recording_catalog().list_names()}
+
+@app.get("/api/recordings/catalog")
+async def recording_catalog():
+    return {"recordings": [info.as_dict() for info in get_recording_catalog().entries()]}
 
 @app.post("/api/recordings/play")
 async def play_recording(action: RecordingAction):
     if state.motors_service:
-        state.motors_service.dispatch("play", action.name)
+        state.motors_service.dispatch("play", {"name": action.name, "rate": action.rate, "duration": action.duration})
     await state.broadcast({"type": "playing", "name": action.name})
     await logger.log_event("recording_play", {"name": action.name})
     return {"status": "ok", "playing": action.name}
 
+# Motor telemetry (position, speed, load, voltage, temperature)
+@app.get("/api/motors/telemetry")
+async def get_motor_telemetry():
+    if not state.motors_service:
+        return {"status": "unavailable", "telemetry": None, "health": {}}
+    return {
+        "status": "ok",
+        "telemetry": state.motors_service.get_telemetry(),
+        "health": state.motors_service.get_motor_health(),
+    }
+
+# Per-animation playback timing and commanded-vs-actual tracking error
+@app.get("/api/motors/stats")
+async def get_motor_stats():
+    if not state.motors_service:
+        return {"status": "unavailable", "playback": {}, "tracking": {}, "bus": {}}
+    return {
+        "status": "ok",
+        "playback": state.motors_service.get_playback_stats(),
+        "tracking": state.motors_service.get_tracking_stats(),
+        "bus": state.motors_service.get_bus_stats(),
+    }
+
 # Conversation Logging
 @app.post("/api/conversation")
 async def log_conversation(message: ConversationMessage):